@@ -5,9 +5,10 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from src.config import settings
 from src.dependencies.deps import DBDep
+from src.init import login_limiter
 from src.schemas.auth import Token
 from src.schemas.users import UserRead, UserCreate
-from src.security import hash_password, verify_password, create_access_token
+from src.security import hash_password_async, verify_password_async, create_access_token
 from src.utilis.enums import RoleEnum
 
 router = APIRouter(prefix="/auth", tags=["Authorization and Authentication"])
@@ -21,25 +22,29 @@ async def register(user: UserCreate, db: DBDep):
     user_data_dict = user.model_dump(exclude={"password"})
     user_data_dict.update({
         "id": uuid.uuid4(),
-        "hashed_password": hash_password(user.password),
+        "hashed_password": await hash_password_async(user.password),
         "role": RoleEnum.USER,
         "is_active": True,
     })
 
     new_user = await db.users.create(user_data_dict)
+    await db.commit()
     return new_user
 
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(db: DBDep, form_data: OAuth2PasswordRequestForm = Depends()):
-    user = await db.users.get_one(username=form_data.username)
-
-    if not user or not verify_password(form_data.password, user.hashed_password):
-        raise HTTPException(
-            status_code=401,
-            detail="Incorrect username or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    async with login_limiter.admit(form_data.username):
+        user = await db.users.get_one(username=form_data.username)
+
+        if not user or not await verify_password_async(form_data.password, user.hashed_password):
+            # в окно попадают только неудачные попытки: успешные логины не блокируют пользователя
+            await login_limiter.record_failure(form_data.username)
+            raise HTTPException(
+                status_code=401,
+                detail="Incorrect username or password",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
 
     access_token = create_access_token(
         data={"user_id": str(user.id), "role": user.role},
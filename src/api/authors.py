@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 import uuid
-from fastapi_cache.decorator import cache
 
+from src.config import settings
 from src.dependencies.deps import get_current_active_user, DBDep
+from src.init import tag_cache, principal_cache
 from src.schemas.authors import AuthorRead, AuthorCreate, AuthorUpdate
 from src.utilis.enums import RoleEnum
 
@@ -10,12 +11,21 @@ router = APIRouter(prefix="/authors", tags=["authors"])
 
 
 @router.get("/{author_id}", response_model=AuthorRead)
-@cache(expire=10*60)
 async def get_author(author_id: uuid.UUID, db: DBDep):
+    cache_key = f"authors:{author_id}"
+    cached = await tag_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    since = await tag_cache.begin()
     author = await db.authors.get_one(id=author_id)
     if not author:
         raise HTTPException(status_code=404, detail="Author not found")
-    return author
+
+    content = AuthorRead.model_validate(author).model_dump_json()
+    await tag_cache.set(cache_key, content, tags=[f"author:{author.id}"], expire=settings.CACHE_EXPIRE,
+                        since=since)
+    return Response(content=content, media_type="application/json")
 
 @router.post("/", response_model=AuthorRead, status_code=status.HTTP_201_CREATED)
 async def create_author(payload: AuthorCreate, db: DBDep, current_user=Depends(get_current_active_user)):
@@ -30,6 +40,8 @@ async def create_author(payload: AuthorCreate, db: DBDep, current_user=Depends(g
 
     author = await db.authors.create(author_data)
     await db.users.update(current_user.id, {"role": RoleEnum.AUTHOR})
+    await db.commit()
+    await principal_cache.invalidate(current_user.id)
     return author
 
 
@@ -43,6 +55,8 @@ async def update_author(author_id: uuid.UUID, payload: AuthorUpdate, db: DBDep,
         raise HTTPException(status_code=403, detail="Forbidden")
 
     updated = await db.authors.update(author_id, payload.model_dump(exclude_unset=True))
+    await db.commit()
+    await tag_cache.invalidate(f"author:{author_id}")
     return updated
 
 
@@ -57,4 +71,7 @@ async def delete_author(author_id: uuid.UUID, db: DBDep, current_user=Depends(ge
 
     await db.authors.delete(id=author_id)
     await db.users.update(author.user_id, {"role": RoleEnum.USER})
+    await db.commit()
+    await principal_cache.invalidate(author.user_id)
+    await tag_cache.invalidate(f"author:{author_id}")
     return None
@@ -1,24 +1,106 @@
+import csv
+import itertools
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi_cache.decorator import cache
+from datetime import datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Response, UploadFile, status
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.exc import DBAPIError
+from starlette.concurrency import run_in_threadpool
 
-from src.dependencies.deps import get_current_active_user, DBDep
-from src.schemas.books import BookRead, BookCreate, BookUpdate
-from src.utilis.enums import RoleEnum
+from src.config import settings
+from src.dependencies.deps import get_current_active_user, get_admin_user, DBDep
+from src.init import redis_manager, tag_cache, book_page_cache, genre_cache
+from src.schemas.books import BookRead, BookDetail, BookCreate, BookUpdate, BookPage, BookImportRow, BookImportResult
+from src.utilis.enums import RoleEnum, BookSortEnum
+from src.utilis.pagination import encode_cursor, decode_cursor
 
 router = APIRouter(prefix="/books", tags=["books"])
 
-@router.get("/{book_id}", response_model=BookRead)
-@cache(expire=10*60)
-async def get_book(book_id: uuid.UUID, db: DBDep):
-    book = await db.books.get_one(id=book_id)
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
-    return book
+books_list_adapter = TypeAdapter(List[BookRead])
+
+
+def _parse_cursor(cursor: str, sort: BookSortEnum):
+    try:
+        value, book_id = decode_cursor(cursor)
+        # курсор приходит от клиента: JSON может содержать что угодно вместо строк
+        if not isinstance(book_id, str) or not isinstance(value, (str, int, float)) or isinstance(value, bool):
+            raise ValueError("Invalid cursor")
+        value = float(value) if sort == BookSortEnum.RATING else datetime.fromisoformat(value)
+        return value, uuid.UUID(book_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def _purge_search_cache():
+    # выдача поиска не размечена тегами: любая запись книги сбрасывает её целиком (SCAN + UNLINK)
+    await redis_manager.delete_pattern("search:books:*", batch_size=settings.REDIS_CLEANUP_BATCH_SIZE)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+
+
+@router.get("", response_model=BookPage)
+async def list_books(
+    db: DBDep,
+    sort: BookSortEnum = BookSortEnum.NEWEST,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    genre_id: uuid.UUID | None = None,
+    author_id: uuid.UUID | None = None,
+    min_rating: float | None = Query(None, ge=0, le=5),
+):
+    after = _parse_cursor(cursor, sort) if cursor else None
+    books, next_key = await db.books.get_page(
+        sort=sort,
+        limit=limit,
+        after=after,
+        genre_id=genre_id,
+        author_id=author_id,
+        min_rating=min_rating,
+    )
+    return {
+        "items": books,
+        "next_cursor": encode_cursor(list(next_key)) if next_key else None,
+    }
+
+
+@router.get("/search", response_model=List[BookRead])
+async def search_books(db: DBDep, q: str = Query(min_length=1, max_length=200), limit: int = Query(20, ge=1, le=50)):
+    # ключи search:books:* сбрасываются при записи книг (_purge_search_cache)
+    cache_key = f"search:books:{limit}:{' '.join(q.lower().split())}"
+    cached = await redis_manager.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    books = await db.books.search(q, limit=limit)
+    content = books_list_adapter.dump_json(books_list_adapter.validate_python(books, from_attributes=True))
+    await redis_manager.set(cache_key, content, expire=10*60)
+    return Response(content=content, media_type="application/json")
+
+
+@router.get("/{book_id}", response_model=BookDetail)
+async def get_book(book_id: uuid.UUID, db: DBDep, if_none_match: Optional[str] = Header(None)):
+    page = await book_page_cache.get(book_id)
+    if page is None:
+        page = await book_page_cache.build(db, book_id)
+        if page is None:
+            raise HTTPException(status_code=404, detail="Book not found")
+
+    etag, content = page
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(content=content, media_type="application/json", headers={"ETag": etag})
 
 
 @router.post("/", response_model=BookRead, status_code=status.HTTP_201_CREATED)
-async def create_book(payload: BookCreate, db: DBDep, current_user=Depends(get_current_active_user)):
+async def create_book(payload: BookCreate, db: DBDep, background_tasks: BackgroundTasks,
+                      current_user=Depends(get_current_active_user)):
     if current_user.role not in [RoleEnum.AUTHOR, RoleEnum.ADMIN]:
         raise HTTPException(status_code=403, detail="Only authors or admins can create books")
 
@@ -38,13 +120,113 @@ async def create_book(payload: BookCreate, db: DBDep, current_user=Depends(get_c
         cover_image=payload.cover_image,
         file_path=payload.file_path,
         author_id=author_id,
-        genre_ids=payload.genre_ids,
+        genres=await genre_cache.get_by_ids(db, payload.genre_ids),
     )
+    await db.commit()
+    await _purge_search_cache()
+    background_tasks.add_task(book_page_cache.rebuild, book.id)
     return book
 
 
+class _ImportLines:
+    # байтовые строки файла декодируются по одной: битый UTF-8 — ошибка этой строки, а не всего импорта
+    def __init__(self, file):
+        self.file = file
+        self.line_no = 0
+        self.bad_lines = []
+
+    def __iter__(self):
+        for raw in self.file:
+            self.line_no += 1
+            try:
+                yield raw.decode("utf-8")
+            except UnicodeDecodeError:
+                self.bad_lines.append(self.line_no)
+
+
+def _iter_import_rows(file, file_format: str):
+    # (номер строки, сырая строка или dict, ошибка); построчно: память не зависит от размера импорта
+    lines = _ImportLines(file)
+    if file_format == "csv":
+        rows = csv.DictReader(lines)
+    else:
+        rows = (line for line in lines if line.strip())
+
+    for row in rows:
+        while lines.bad_lines:
+            yield lines.bad_lines.pop(0), None, "invalid UTF-8"
+        if file_format == "csv":
+            row = {key: value or None for key, value in row.items()}
+            row["genre_ids"] = [genre_id for genre_id in (row.get("genre_ids") or "").split(";") if genre_id]
+        yield lines.line_no, row, None
+    for line_no in lines.bad_lines:
+        yield line_no, None, "invalid UTF-8"
+
+
+def _next_import_rows(rows, size: int) -> list:
+    return list(itertools.islice(rows, size))
+
+
+@router.post("/bulk", response_model=BookImportResult, dependencies=[get_admin_user])
+async def bulk_import_books(db: DBDep, file: UploadFile, format: Literal["ndjson", "csv"] = "ndjson"):
+    result = BookImportResult(imported=0, skipped=0)
+    batch = []
+    known_genres = {genre.id for genre in await genre_cache.get_all(db)}
+
+    def add_error(message: str):
+        result.skipped += 1
+        if len(result.errors) < 100:
+            result.errors.append(message)
+
+    async def flush():
+        books = [book for _, book in batch]
+        try:
+            imported, rejected = await db.books.bulk_import(books, known_genres)
+            await db.commit()
+        except DBAPIError:
+            # уже зафиксированные пачки остаются, эта откатывается целиком и попадает в отчёт построчно
+            await db.rollback()
+            for line_no, _ in batch:
+                add_error(f"line {line_no}: rejected by the database, batch rolled back")
+            batch.clear()
+            return
+        result.imported += imported
+        for book in rejected:
+            add_error(f"book «{book['title']}»: author {book['author_id']} not found")
+        # повторный импорт существующих id обновляет книги — сбрасываем их кэш
+        await tag_cache.invalidate(*(f"book:{book['id']}" for book in books if book["id"]))
+        batch.clear()
+
+    # чтение и разбор файла (UploadFile может лежать на диске) — в пуле потоков, пачками
+    rows = _iter_import_rows(file.file, format)
+    while chunk := await run_in_threadpool(_next_import_rows, rows, settings.BULK_IMPORT_BATCH_SIZE):
+        for line_no, raw, error in chunk:
+            if error:
+                add_error(f"line {line_no}: {error}")
+                continue
+            try:
+                if isinstance(raw, str):
+                    row = BookImportRow.model_validate_json(raw)
+                else:
+                    row = BookImportRow.model_validate(raw)
+            except ValidationError as exc:
+                add_error(f"line {line_no}: {exc.errors()[0]['msg']}")
+                continue
+
+            batch.append((line_no, row.model_dump()))
+            if len(batch) >= settings.BULK_IMPORT_BATCH_SIZE:
+                await flush()
+
+    if batch:
+        await flush()
+    if result.imported:
+        await _purge_search_cache()
+    return result
+
+
 @router.put("/{book_id}", response_model=BookRead)
-async def update_book(book_id: uuid.UUID, payload: BookUpdate, db: DBDep, current_user=Depends(get_current_active_user)):
+async def update_book(book_id: uuid.UUID, payload: BookUpdate, db: DBDep, background_tasks: BackgroundTasks,
+                      current_user=Depends(get_current_active_user)):
     book = await db.books.get_one(id=book_id)
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
@@ -56,7 +238,12 @@ async def update_book(book_id: uuid.UUID, payload: BookUpdate, db: DBDep, curren
     elif current_user.role != RoleEnum.ADMIN:
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    updated = await db.books.update_with_genres(book, payload.model_dump(exclude_unset=True, exclude={"genre_ids"}), payload.genre_ids)
+    genres = None if payload.genre_ids is None else await genre_cache.get_by_ids(db, payload.genre_ids)
+    updated = await db.books.update_with_genres(book, payload.model_dump(exclude_unset=True, exclude={"genre_ids"}), genres)
+    await db.commit()
+    await tag_cache.invalidate(f"book:{book_id}")
+    await _purge_search_cache()
+    background_tasks.add_task(book_page_cache.rebuild, book_id)
     return updated
 
 
@@ -74,4 +261,7 @@ async def delete_book(book_id: uuid.UUID, db: DBDep, current_user=Depends(get_cu
         raise HTTPException(status_code=403, detail="Forbidden")
 
     await db.books.delete(id=book_id)
+    await db.commit()
+    await tag_cache.invalidate(f"book:{book_id}")
+    await _purge_search_cache()
     return None
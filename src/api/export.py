@@ -0,0 +1,62 @@
+import csv
+import io
+from typing import Literal, Type
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.dependencies.deps import get_admin_user, SessionFactoryDep
+from src.schemas.books import BookInDB
+from src.schemas.reviews import ReviewRead
+from src.schemas.users import UserRead
+from src.utilis.db_manager import DBManager
+
+router = APIRouter(prefix="/export", tags=["Export"], dependencies=[get_admin_user])
+
+ExportFormat = Literal["ndjson", "csv"]
+
+
+async def _export_rows(session_factory: async_sessionmaker, repository_name: str, schema: Type[BaseModel],
+                       file_format: ExportFormat):
+    # сессия открывается внутри генератора: зависимости с yield закрываются до начала отправки тела
+    async with DBManager(session_factory=session_factory) as db:
+        repository = getattr(db, repository_name)
+        if file_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(schema.model_fields.keys())
+            yield buffer.getvalue()
+            async for chunk in repository.stream(schema):
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(item.model_dump(mode="json").values() for item in chunk)
+                yield buffer.getvalue()
+        else:
+            async for chunk in repository.stream(schema):
+                yield "".join(item.model_dump_json() + "\n" for item in chunk)
+
+
+def _export_response(session_factory: async_sessionmaker, repository_name: str, schema: Type[BaseModel],
+                     file_format: ExportFormat) -> StreamingResponse:
+    media_type = "text/csv" if file_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _export_rows(session_factory, repository_name, schema, file_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{repository_name}.{file_format}"'},
+    )
+
+
+@router.get("/books")
+async def export_books(session_factory: SessionFactoryDep, format: ExportFormat = "ndjson"):
+    return _export_response(session_factory, "books", BookInDB, format)
+
+
+@router.get("/reviews")
+async def export_reviews(session_factory: SessionFactoryDep, format: ExportFormat = "ndjson"):
+    return _export_response(session_factory, "reviews", ReviewRead, format)
+
+
+@router.get("/users")
+async def export_users(session_factory: SessionFactoryDep, format: ExportFormat = "ndjson"):
+    return _export_response(session_factory, "users", UserRead, format)
@@ -1,8 +1,9 @@
 import uuid
-from typing import List
+from typing import Dict, List
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from src.dependencies.deps import get_current_active_user, DBDep
+from src.schemas.books import BookStatusRequest
 from src.schemas.favourites import FavouriteRead, FavouriteCreate
 
 router = APIRouter(prefix="/favourites", tags=["Favourites"])
@@ -10,7 +11,7 @@ router = APIRouter(prefix="/favourites", tags=["Favourites"])
 
 @router.get("", response_model=List[FavouriteRead])
 async def list_favourites(db: DBDep, current_user=Depends(get_current_active_user)):
-    return await db.favourites.get_many(user_id=current_user.id)
+    return await db.favourites.get_many_projected(user_id=current_user.id)
 
 
 @router.post("", response_model=FavouriteRead, status_code=status.HTTP_201_CREATED)
@@ -26,12 +27,20 @@ async def add_favourite(payload: FavouriteCreate, db: DBDep, current_user=Depend
         "user_id": current_user.id
     }
     fav = await db.favourites.create(fav_data)
+    await db.commit()
     return fav
 
 
+@router.post("/status", response_model=Dict[uuid.UUID, bool])
+async def favourites_status(payload: BookStatusRequest, db: DBDep, current_user=Depends(get_current_active_user)):
+    favourited = await db.favourites.get_favourited_book_ids(current_user.id, payload.book_ids)
+    return {book_id: book_id in favourited for book_id in payload.book_ids}
+
+
 @router.delete("/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_favourite(book_id: uuid.UUID, db: DBDep, current_user=Depends(get_current_active_user)):
     deleted = await db.favourites.delete(user_id=current_user.id, book_id=book_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Favourite not found")
+    await db.commit()
     return None
@@ -3,20 +3,23 @@ from typing import List
 from fastapi import APIRouter, HTTPException, status
 
 from src.dependencies.deps import get_admin_user, DBDep
-from src.schemas.genres import GenreRead, GenreCreate
+from src.init import tag_cache, genre_cache
+from src.schemas.genres import GenreRead, GenreCreate, GenreWithCount
 
 router = APIRouter(prefix="/genres", tags=["Genres"])
 
 
-@router.get("", response_model=List[GenreRead])
+@router.get("", response_model=List[GenreWithCount])
 async def list_genres(db: DBDep):
-    return await db.genres.get_many()
+    return await genre_cache.get_all(db)
 
 
 @router.post("", response_model=GenreRead, status_code=status.HTTP_201_CREATED, dependencies=[get_admin_user])
 async def create_genre(payload: GenreCreate, db: DBDep):
     genre_data = payload.model_copy(update={"id": uuid.uuid4()})
     genre = await db.genres.create(genre_data)
+    await db.commit()
+    await genre_cache.invalidate()
     return genre
 
 
@@ -25,6 +28,9 @@ async def update_genre(genre_id: uuid.UUID, payload: GenreCreate, db: DBDep):
     updated = await db.genres.update(genre_id, payload.model_dump())
     if not updated:
         raise HTTPException(status_code=404, detail="Genre not found")
+    await db.commit()
+    await tag_cache.invalidate(f"genre:{genre_id}")
+    await genre_cache.invalidate()
     return updated
 
 
@@ -33,4 +39,7 @@ async def delete_genre(genre_id: uuid.UUID, db: DBDep):
     deleted = await db.genres.delete(id=genre_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Genre not found")
+    await db.commit()
+    await tag_cache.invalidate(f"genre:{genre_id}")
+    await genre_cache.invalidate()
     return None
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+
+from src.database import engine
+from src.dependencies.deps import get_admin_user
+from src.schemas.metrics import PasswordHasherStats, DBPoolStats
+from src.security import password_hasher
+from src.utilis.db_pool import pool_stats
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"], dependencies=[get_admin_user])
+
+
+@router.get("/password-hasher", response_model=PasswordHasherStats)
+async def get_password_hasher_stats():
+    return password_hasher.stats()
+
+
+@router.get("/db-pool", response_model=DBPoolStats)
+async def get_db_pool_stats():
+    return pool_stats(engine)
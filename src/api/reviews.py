@@ -1,17 +1,20 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Dict
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 
 from src.dependencies.deps import get_current_active_user, DBDep
+from src.init import tag_cache, book_page_cache
+from src.schemas.books import BookStatusRequest
 from src.schemas.reviews import ReviewRead, ReviewCreate, ReviewUpdate
 from src.utilis.enums import RoleEnum
-from src.tasks.notifications import send_notification_to_author
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
 
 @router.post("/", response_model=ReviewRead, status_code=status.HTTP_201_CREATED)
-async def create_review(payload: ReviewCreate, db: DBDep, current_user=Depends(get_current_active_user)):
-    if not await db.books.exists(id=payload.book_id):
+async def create_review(payload: ReviewCreate, db: DBDep, background_tasks: BackgroundTasks, current_user=Depends(get_current_active_user)):
+    author_id = await db.books.get_author_id(payload.book_id)
+    if not author_id:
         raise HTTPException(status_code=404, detail="Book not found")
 
     if await db.reviews.exists(book_id=payload.book_id, user_id=current_user.id):
@@ -24,23 +27,34 @@ async def create_review(payload: ReviewCreate, db: DBDep, current_user=Depends(g
         "user_id": current_user.id
     }
     review = await db.reviews.create(review_data)
-
-    send_notification_to_author.delay(str(payload.book_id), str(current_user.id))
+    # уведомление автору уходит через outbox: фиксируется тем же commit, что и отзыв
+    db.outbox.add("review.created", {
+        "author_id": str(author_id),
+        "book_id": str(payload.book_id),
+        "user_id": str(current_user.id),
+    })
+    await db.commit()
+    await tag_cache.invalidate(f"book:{payload.book_id}")
+    # рейтинг в карточке книги изменился: пересобираем её после ответа
+    background_tasks.add_task(book_page_cache.rebuild, payload.book_id)
 
     return review
 
 
+@router.post("/status", response_model=Dict[uuid.UUID, bool])
+async def reviews_status(payload: BookStatusRequest, db: DBDep, current_user=Depends(get_current_active_user)):
+    reviewed = await db.reviews.get_reviewed_book_ids(current_user.id, payload.book_ids)
+    return {book_id: book_id in reviewed for book_id in payload.book_ids}
+
+
 @router.put("/{book_id}", response_model=ReviewRead)
-async def update_review(book_id: uuid.UUID, payload: ReviewUpdate, db: DBDep, current_user=Depends(get_current_active_user)):
+async def update_review(book_id: uuid.UUID, payload: ReviewUpdate, db: DBDep, background_tasks: BackgroundTasks,
+                        current_user=Depends(get_current_active_user)):
     if current_user.role == RoleEnum.ADMIN:
         target_user_id = payload.user_id or current_user.id
     else:
         target_user_id = current_user.id
 
-    review = await db.reviews.get_one(book_id=book_id, user_id=target_user_id)
-    if not review:
-        raise HTTPException(status_code=404, detail="Review not found")
-
     updated = await db.reviews.update(
         {"book_id": book_id, "user_id": target_user_id},
         payload.model_dump(exclude_unset=True, exclude={"user_id"})
@@ -48,11 +62,14 @@ async def update_review(book_id: uuid.UUID, payload: ReviewUpdate, db: DBDep, cu
     if not updated:
         raise HTTPException(status_code=404, detail="Review not found")
 
+    await db.commit()
+    await tag_cache.invalidate(f"book:{book_id}")
+    background_tasks.add_task(book_page_cache.rebuild, book_id)
     return updated
 
 
 @router.delete("/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_review(book_id: uuid.UUID, db: DBDep, current_user=Depends(get_current_active_user), user_id: uuid.UUID | None = None):
+async def delete_review(book_id: uuid.UUID, db: DBDep, background_tasks: BackgroundTasks, current_user=Depends(get_current_active_user), user_id: uuid.UUID | None = None):
     target_user_id = current_user.id
     if current_user.role == RoleEnum.ADMIN:
         if not user_id:
@@ -63,4 +80,7 @@ async def delete_review(book_id: uuid.UUID, db: DBDep, current_user=Depends(get_
     if not deleted:
         raise HTTPException(status_code=404, detail="Review not found")
 
+    await db.commit()
+    await tag_cache.invalidate(f"book:{book_id}")
+    background_tasks.add_task(book_page_cache.rebuild, book_id)
     return None
@@ -0,0 +1,20 @@
+from typing import List
+from fastapi import APIRouter, Query
+from fastapi_cache.decorator import cache
+
+from src.dependencies.deps import DBDep
+from src.schemas.stats import BookStatsRead, AuthorStatsRead
+
+router = APIRouter(prefix="/stats", tags=["Stats"])
+
+
+@router.get("/books/top", response_model=List[BookStatsRead])
+@cache(expire=5*60)
+async def get_top_books(db: DBDep, limit: int = Query(20, ge=1, le=100), min_reviews: int = Query(1, ge=0)):
+    return await db.book_stats.get_top(limit=limit, min_reviews=min_reviews)
+
+
+@router.get("/authors/top", response_model=List[AuthorStatsRead])
+@cache(expire=5*60)
+async def get_top_authors(db: DBDep, limit: int = Query(20, ge=1, le=100)):
+    return await db.author_stats.get_top(limit=limit)
@@ -3,13 +3,21 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from src.dependencies.deps import get_current_active_user, DBDep
+from src.init import principal_cache, tag_cache
 from src.schemas.users import UserRead, UserUpdateSelf, UserUpdateAdmin
-from src.security import hash_password
+from src.security import hash_password_async
 from src.utilis.enums import RoleEnum
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
+async def _invalidate_author_pages(db, user_id: uuid.UUID):
+    # username автора входит в закэшированные карточки его книг (тег author:<id>)
+    author = await db.authors.get_one_projected(user_id=user_id)
+    if author:
+        await tag_cache.invalidate(f"author:{author.id}")
+
+
 @router.get("", response_model=List[UserRead])
 async def list_users(db: DBDep, current_user=Depends(get_current_active_user)):
     if current_user.role != RoleEnum.ADMIN:
@@ -35,10 +43,14 @@ async def update_me(payload: UserUpdateSelf, db: DBDep, current_user=Depends(get
         raise HTTPException(status_code=400, detail="No data to update")
 
     if "password" in update_data:
-        update_data["hashed_password"] = hash_password(update_data.pop("password"))
+        update_data["hashed_password"] = await hash_password_async(update_data.pop("password"))
 
-    await db.users.update(current_user.id, update_data)
-    return await db.users.get_one(id=current_user.id)
+    updated = await db.users.update(current_user.id, update_data)
+    await db.commit()
+    await principal_cache.invalidate(current_user.id)
+    if "username" in update_data:
+        await _invalidate_author_pages(db, current_user.id)
+    return updated
 
 
 @router.patch("/{user_id}", response_model=UserRead)
@@ -51,12 +63,16 @@ async def update_user_as_admin(user_id: uuid.UUID, payload: UserUpdateAdmin, db:
         raise HTTPException(status_code=400, detail="No data to update")
 
     if "password" in update_data:
-        update_data["hashed_password"] = hash_password(update_data.pop("password"))
+        update_data["hashed_password"] = await hash_password_async(update_data.pop("password"))
 
     updated = await db.users.update(user_id, update_data)
     if not updated:
         raise HTTPException(status_code=404, detail="User not found")
 
+    await db.commit()
+    await principal_cache.invalidate(user_id)
+    if "username" in update_data:
+        await _invalidate_author_pages(db, user_id)
     return updated
 
 
@@ -65,8 +81,16 @@ async def delete_user(user_id: uuid.UUID, db: DBDep, current_user=Depends(get_cu
     if current_user.role != RoleEnum.ADMIN:
         raise HTTPException(status_code=403, detail="Forbidden")
 
+    # профиль автора удалится каскадом: id для инвалидации его карточек берём заранее
+    author = await db.authors.get_one_projected(user_id=user_id)
+    # каскад в БД не пересчитает агрегаты рейтинга книг, поэтому отзывы удаляем явно
+    await db.reviews.delete(user_id=user_id)
     deleted = await db.users.delete(id=user_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="User not found")
 
+    await db.commit()
+    await principal_cache.invalidate(user_id)
+    if author:
+        await tag_cache.invalidate(f"author:{author.id}")
     return None
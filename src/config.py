@@ -1,8 +1,20 @@
-from typing import Literal
+from typing import List, Literal
 
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+# path — регулярное выражение на весь путь запроса, пустой methods — любые методы;
+# scope "user": id из access-токена, для анонимных запросов — IP клиента
+class RateLimitPolicy(BaseModel):
+    name: str
+    limit: int
+    window: int
+    path: str = ".*"
+    methods: List[str] = []
+    scope: Literal["user", "ip"] = "user"
+
+
 class Settings(BaseSettings):
     MODE: Literal["TEST", "LOCAL", "DEV", "PROD"]
 
@@ -12,9 +24,30 @@ class Settings(BaseSettings):
     DB_PASS: str
     DB_HOST: str
 
+    # размер пула на процесс: (DB_POOL_SIZE + DB_MAX_OVERFLOW) * число воркеров < max_connections
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 30 * 60
+    DB_POOL_PRE_PING: bool = True
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    DB_STATEMENT_CACHE_SIZE: int = 500
+
+    CELERY_DB_POOL_SIZE: int = 2
+    CELERY_DB_MAX_OVERFLOW: int = 2
+
     REDIS_HOST: str
     REDIS_PORT: int
 
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT: float = 5.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 2.0
+    # клиентский кэш (RESP3 tracking, Redis >= 6): ключи с этими префиксами читаются из памяти процесса
+    REDIS_CLIENT_CACHE_ENABLED: bool = False
+    REDIS_CLIENT_CACHE_PREFIXES: List[str] = ["cache:books:"]
+    REDIS_CLIENT_CACHE_SIZE: int = 10_000
+    REDIS_CLIENT_CACHE_TTL: float = 60.0
+
     SMTP_HOST: str
     SMTP_PORT: int
     SMTP_USER: str
@@ -23,6 +56,44 @@ class Settings(BaseSettings):
     SMTP_TLS: bool
     FRONTEND_URL: str
 
+    SMTP_POOL_SIZE: int = 2
+    NOTIFICATION_COALESCE_SECONDS: int = 60
+    # digest: отзывы копятся в Redis stream автора, письмо-сводка раз в NOTIFICATION_DIGEST_MINUTES
+    NOTIFICATION_MODE: Literal["instant", "digest"] = "instant"
+    NOTIFICATION_DIGEST_MINUTES: int = 60
+
+    OUTBOX_RELAY_SECONDS: int = 5
+    OUTBOX_BATCH_SIZE: int = 500
+
+    BULK_IMPORT_BATCH_SIZE: int = 1000
+
+    CACHE_EXPIRE: int = 6 * 60 * 60
+    REDIS_CLEANUP_BATCH_SIZE: int = 500
+
+    # список жанров: копия в памяти воркера + Redis; books_count отстаёт не более чем на GENRE_CACHE_EXPIRE
+    GENRE_CACHE_LOCAL_TTL: float = 30.0
+    GENRE_CACHE_EXPIRE: int = 2 * 60
+
+    # локальный TTL ограничивает рассинхрон между воркерами после смены роли/блокировки
+    AUTH_CACHE_SIZE: int = 10_000
+    AUTH_CACHE_LOCAL_TTL: float = 5.0
+    AUTH_CACHE_EXPIRE: int = 60
+
+    PASSWORD_HASH_WORKERS: int = 4
+
+    LOGIN_MAX_IN_FLIGHT: int = 32
+    LOGIN_ATTEMPTS_PER_USERNAME: int = 10
+    LOGIN_ATTEMPTS_WINDOW: int = 60
+
+    # sliding window на запрос; все подходящие политики проверяются одним Lua-скриптом.
+    # В .env задаётся JSON-списком: RATE_LIMIT_POLICIES='[{"name": "...", "limit": 100, "window": 60}]'
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_POLICIES: List[RateLimitPolicy] = [
+        RateLimitPolicy(name="default", limit=600, window=60),
+        RateLimitPolicy(name="book-detail", path=r"/books/[0-9a-fA-F-]{36}", methods=["GET"], limit=120, window=60),
+        RateLimitPolicy(name="login", path=r"/auth/token", methods=["POST"], limit=60, window=60, scope="ip"),
+    ]
+
     @property
     def REDIS_URL(self):
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}"
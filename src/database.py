@@ -3,12 +3,34 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from src.config import settings
+from src.utilis.db_pool import InstrumentedAsyncPool
 
-engine = create_async_engine(settings.DB_URL)
+
+def build_engine(**overrides):
+    options = dict(
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            # кэш подготовленных выражений: SQLAlchemy-адаптер и сам asyncpg
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+    options.update(overrides)
+    return create_async_engine(settings.DB_URL, **options)
+
+
+engine = build_engine()
 engine_null_pool = create_async_engine(settings.DB_URL, poolclass=NullPool)
 
 async_session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
 async_session_maker_null_pool = async_sessionmaker(bind=engine_null_pool, expire_on_commit=False)
 
 class Base(DeclarativeBase):
-    pass
\ No newline at end of file
+    # ORM-объекты, сохранённые через add + flush (create с экземпляром модели), получают
+    # server-side значения сразу в RETURNING того же INSERT/UPDATE, без ленивой догрузки в async
+    __mapper_args__ = {"eager_defaults": True}
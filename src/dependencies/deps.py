@@ -2,12 +2,13 @@ import uuid
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from typing import Annotated
 
 from src.database import async_session_maker
-from src.models import UsersOrm
+from src.init import principal_cache
 from src.schemas.auth import TokenData
+from src.schemas.users import UserPrincipal
 from src.security import decode_access_token
 from src.utilis.enums import RoleEnum
 from src.utilis.db_manager import DBManager
@@ -22,10 +23,18 @@ async def get_db():
 
 DBDep = Annotated[DBManager, Depends(get_db)]
 
+
+def get_session_factory() -> async_sessionmaker:
+    # для сессий, живущих дольше зависимости (потоковые ответы); переопределяется в тестах вместе с get_db
+    return async_session_maker
+
+
+SessionFactoryDep = Annotated[async_sessionmaker, Depends(get_session_factory)]
+
 async def get_current_user(
     db: DBDep,
     token: str = Depends(oauth2_scheme),
-) -> UsersOrm:
+) -> UserPrincipal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -34,20 +43,28 @@ async def get_current_user(
     payload = decode_access_token(token)
     data = TokenData(**payload)
 
-    user = await db.users.get_one(id=data.user_id)
-    if not user or not user.is_active:
+    principal = await principal_cache.get(data.user_id)
+    if principal is None:
+        since = await principal_cache.begin(data.user_id)
+        user = await db.users.get_one(id=data.user_id)
+        if not user:
+            raise credentials_exception
+        principal = UserPrincipal.model_validate(user)
+        await principal_cache.set(principal, since)
+
+    if not principal.is_active:
         raise credentials_exception
-    return user
+    return principal
 
 
-async def get_current_active_user(current_user: UsersOrm = Depends(get_current_user)) -> UsersOrm:
+async def get_current_active_user(current_user: UserPrincipal = Depends(get_current_user)) -> UserPrincipal:
     if not current_user.is_active:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
     return current_user
 
 
 def role_checker(*allowed_roles: RoleEnum):
-    async def checker(current_user: UsersOrm = Depends(get_current_active_user)):
+    async def checker(current_user: UserPrincipal = Depends(get_current_active_user)):
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -61,7 +78,7 @@ get_admin_user = Depends(role_checker(RoleEnum.ADMIN))
 get_author_user = Depends(role_checker(RoleEnum.AUTHOR, RoleEnum.ADMIN))
 get_basic_user = Depends(role_checker(RoleEnum.USER, RoleEnum.AUTHOR, RoleEnum.ADMIN))
 
-async def self_or_admin(user_id: uuid.UUID, current_user: UsersOrm = Depends(get_current_active_user)):
+async def self_or_admin(user_id: uuid.UUID, current_user: UserPrincipal = Depends(get_current_active_user)):
     if current_user.id == user_id:
         return current_user
     if current_user.role != RoleEnum.ADMIN:
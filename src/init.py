@@ -1,7 +1,49 @@
 from src.config import settings
+from src.database import async_session_maker
+from src.utilis.book_page_cache import BookPageCache
+from src.utilis.client_cache import ClientSideCache
+from src.utilis.genre_cache import GenreCache
+from src.utilis.login_limiter import LoginLimiter
+from src.utilis.principal_cache import PrincipalCache
+from src.utilis.rate_limit import SlidingWindowRateLimiter
 from src.utilis.redis_manager import RedisManager
+from src.utilis.tag_cache import TagCache
+
+client_cache = ClientSideCache(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    prefixes=settings.REDIS_CLIENT_CACHE_PREFIXES,
+    maxsize=settings.REDIS_CLIENT_CACHE_SIZE,
+    ttl=settings.REDIS_CLIENT_CACHE_TTL,
+) if settings.REDIS_CLIENT_CACHE_ENABLED else None
 
 redis_manager = RedisManager(
     host=settings.REDIS_HOST,
     port=settings.REDIS_PORT,
-)
\ No newline at end of file
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+    client_cache=client_cache,
+)
+
+tag_cache = TagCache(redis_manager)
+
+genre_cache = GenreCache(redis_manager, local_ttl=settings.GENRE_CACHE_LOCAL_TTL, expire=settings.GENRE_CACHE_EXPIRE)
+
+book_page_cache = BookPageCache(tag_cache, session_factory=async_session_maker, expire=settings.CACHE_EXPIRE)
+
+principal_cache = PrincipalCache(
+    redis_manager,
+    maxsize=settings.AUTH_CACHE_SIZE,
+    local_ttl=settings.AUTH_CACHE_LOCAL_TTL,
+    redis_ttl=settings.AUTH_CACHE_EXPIRE,
+)
+
+login_limiter = LoginLimiter(
+    redis_manager,
+    max_in_flight=settings.LOGIN_MAX_IN_FLIGHT,
+    attempts=settings.LOGIN_ATTEMPTS_PER_USERNAME,
+    window=settings.LOGIN_ATTEMPTS_WINDOW,
+)
+
+rate_limiter = SlidingWindowRateLimiter(redis_manager, settings.RATE_LIMIT_POLICIES)
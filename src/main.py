@@ -18,20 +18,30 @@ from src.api.books import router as router_books
 from src.api.genres import router as router_genres
 from src.api.reviews import router as router_reviews
 from src.api.favourites import router as router_favourites
+from src.api.stats import router as router_stats
+from src.api.metrics import router as router_metrics
+from src.api.export import router as router_export
 
-from src.init import redis_manager
+from src.config import settings
+from src.init import redis_manager, rate_limiter, genre_cache
+from src.utilis.rate_limit import RateLimitMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await redis_manager.connect()
     FastAPICache.init(RedisBackend(redis_manager.redis), prefix="fastapi-cache")
+    await genre_cache.start()
     yield
+    await genre_cache.stop()
     await redis_manager.close()
 
 
 app = FastAPI(lifespan=lifespan)
 
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
 app.include_router(router_auth)
 app.include_router(router_users)
 app.include_router(router_authors)
@@ -39,6 +49,9 @@ app.include_router(router_books)
 app.include_router(router_genres)
 app.include_router(router_reviews)
 app.include_router(router_favourites)
+app.include_router(router_stats)
+app.include_router(router_metrics)
+app.include_router(router_export)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,34 @@
+"""book listing indexes
+
+Revision ID: 5b1e7c9d2a40
+Revises: 244ddd7d560a
+Create Date: 2026-10-18 10:00:12.481305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c9d2a40'
+down_revision: Union[str, Sequence[str], None] = '244ddd7d560a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_books_upload_date_id', 'books', ['upload_date', 'id'], unique=False)
+    op.create_index('ix_books_rating_id', 'books', ['rating', 'id'], unique=False)
+    op.create_index('ix_books_author_id_upload_date_id', 'books', ['author_id', 'upload_date', 'id'], unique=False)
+    op.create_index('ix_book_genre_genre_id', 'book_genre', ['genre_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_book_genre_genre_id', table_name='book_genre')
+    op.drop_index('ix_books_author_id_upload_date_id', table_name='books')
+    op.drop_index('ix_books_rating_id', table_name='books')
+    op.drop_index('ix_books_upload_date_id', table_name='books')
@@ -0,0 +1,44 @@
+"""book rating aggregate
+
+Revision ID: c4d81f0b7e52
+Revises: 9f3a2d6e8c17
+Create Date: 2026-10-18 11:00:05.337210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d81f0b7e52'
+down_revision: Union[str, Sequence[str], None] = '9f3a2d6e8c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('books', sa.Column('rating_sum', sa.BigInteger(), server_default=sa.text('0'), nullable=False))
+    op.add_column('books', sa.Column('rating_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.execute(
+        """
+        UPDATE books
+        SET rating_sum = agg.rating_sum,
+            rating_count = agg.rating_count,
+            rating = agg.rating_sum::float / agg.rating_count
+        FROM (
+            SELECT book_id, sum(rating) AS rating_sum, count(*) AS rating_count
+            FROM reviews
+            GROUP BY book_id
+        ) AS agg
+        WHERE books.id = agg.book_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('books', 'rating_count')
+    op.drop_column('books', 'rating_sum')
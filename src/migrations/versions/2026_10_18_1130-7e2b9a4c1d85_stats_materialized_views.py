@@ -0,0 +1,32 @@
+"""stats materialized views
+
+Revision ID: 7e2b9a4c1d85
+Revises: c4d81f0b7e52
+Create Date: 2026-10-18 11:30:21.775902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.models.stats import CREATE_STATS_VIEWS, DROP_STATS_VIEWS
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e2b9a4c1d85'
+down_revision: Union[str, Sequence[str], None] = 'c4d81f0b7e52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in CREATE_STATS_VIEWS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for statement in DROP_STATS_VIEWS:
+        op.execute(statement)
@@ -4,3 +4,4 @@ from src.models.genres import GenresOrm
 from src.models.authors import AuthorsOrm
 from src.models.favourites import FavouritesOrm
 from src.models.reviews import ReviewsOrm
+from src.models.outbox import OutboxOrm
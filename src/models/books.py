@@ -2,9 +2,9 @@ import uuid
 from datetime import datetime, timezone
 from typing import Optional, List
 
-from sqlalchemy import String, DateTime, ForeignKey, Float, text
+from sqlalchemy import String, DateTime, ForeignKey, Float, BigInteger, Integer, Index, Computed, DDL, event, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, TSVECTOR
 
 from src.database import Base
 from src.utilis.columns import uuid_pk
@@ -23,8 +23,29 @@ class BooksOrm(Base):
                                                  nullable=False, index=True)
     author: Mapped["AuthorsOrm"] = relationship(back_populates="books") # type: ignore[name-defined]
     rating: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default=text("0"))
-    genres: Mapped[List["GenresOrm"]] = relationship(secondary="book_genre",back_populates="books",lazy="selectin") # type: ignore[name-defined]
+    # денормализованный агрегат отзывов, поддерживается ReviewRepository
+    rating_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default=text("0"))
+    rating_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))", persisted=True),
+        deferred=True,
+    )
+    # загрузка жанров задаётся в запросах BookRepository (selectinload), неявный SQL запрещён
+    genres: Mapped[List["GenresOrm"]] = relationship(secondary="book_genre",back_populates="books",lazy="raise_on_sql") # type: ignore[name-defined]
     reviews: Mapped[List["ReviewsOrm"]] = relationship(back_populates="book", cascade="all,delete-orphan", # type: ignore[name-defined]
                                                        passive_deletes=True)
     favourites: Mapped[List["FavouritesOrm"]] = relationship(back_populates="book", cascade="all,delete-orphan", # type: ignore[name-defined]
                                                              passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_books_upload_date_id", "upload_date", "id"),
+        Index("ix_books_rating_id", "rating", "id"),
+        Index("ix_books_author_id_upload_date_id", "author_id", "upload_date", "id"),
+        Index("ix_books_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_books_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+    )
+
+
+# gin_trgm_ops требует расширение pg_trgm ещё до создания индекса (create_all в тестах)
+event.listen(BooksOrm.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
@@ -1,7 +1,7 @@
 import uuid
 
 from typing import List
-from sqlalchemy import String, Table, Column, ForeignKey
+from sqlalchemy import String, Table, Column, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 
@@ -15,7 +15,8 @@ class GenresOrm(Base):
     id: Mapped[uuid.UUID] = uuid_pk()
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False, index=True)
 
-    books: Mapped[List["BooksOrm"]] = relationship(secondary="book_genre",back_populates="genres", lazy="selectin")
+    # книги жанра никогда не грузятся неявно: для количества см. GenreRepository.get_all_with_book_counts
+    books: Mapped[List["BooksOrm"]] = relationship(secondary="book_genre",back_populates="genres", lazy="noload")
 
 
 # ---------- Ассоциация Book-Genre (many-to-many) ----------
@@ -24,4 +25,5 @@ book_genre = Table(
     Base.metadata,
     Column("book_id", PG_UUID(as_uuid=True), ForeignKey("books.id", ondelete="CASCADE"), primary_key=True),
     Column("genre_id", PG_UUID(as_uuid=True), ForeignKey("genres.id", ondelete="CASCADE"), primary_key=True),
-)
\ No newline at end of file
+    Index("ix_book_genre_genre_id", "genre_id"),
+)
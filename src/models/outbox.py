@@ -0,0 +1,19 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, Identity, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+
+from src.database import Base
+
+
+# Transactional outbox: событие пишется в той же транзакции, что и доменная запись,
+# и публикуется в Celery ретранслятором src.tasks.outbox.relay_outbox
+class OutboxOrm(Base):
+    __tablename__ = "outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    topic: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False,
+                                                 default=lambda: datetime.now(timezone.utc), server_default=func.now())
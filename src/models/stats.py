@@ -0,0 +1,76 @@
+from sqlalchemy import BigInteger, Float, String, column, table
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+# Материализованные представления (DDL ниже, обновляет refresh_materialized_views).
+# Объявлены через table(), чтобы не попадать в Base.metadata и create_all.
+book_stats = table(
+    "book_stats",
+    column("book_id", PG_UUID(as_uuid=True)),
+    column("author_id", PG_UUID(as_uuid=True)),
+    column("title", String),
+    column("review_count", BigInteger),
+    column("avg_rating", Float),
+    column("favourite_count", BigInteger),
+)
+
+top_authors = table(
+    "top_authors",
+    column("author_id", PG_UUID(as_uuid=True)),
+    column("username", String),
+    column("book_count", BigInteger),
+    column("review_count", BigInteger),
+    column("avg_rating", Float),
+    column("favourite_count", BigInteger),
+)
+
+
+# DDL представлений: общий для миграции 7e2b9a4c1d85 и тестовой схемы, которую строит create_all.
+# REFRESH ... CONCURRENTLY требует уникальный индекс; top_authors строится поверх book_stats
+CREATE_STATS_VIEWS = (
+    """
+    CREATE MATERIALIZED VIEW book_stats AS
+    SELECT
+        b.id AS book_id,
+        b.author_id,
+        b.title,
+        coalesce(r.review_count, 0) AS review_count,
+        coalesce(r.avg_rating, 0) AS avg_rating,
+        coalesce(f.favourite_count, 0) AS favourite_count
+    FROM books b
+    LEFT JOIN (
+        SELECT book_id, count(*) AS review_count, avg(rating)::float AS avg_rating
+        FROM reviews
+        GROUP BY book_id
+    ) AS r ON r.book_id = b.id
+    LEFT JOIN (
+        SELECT book_id, count(*) AS favourite_count
+        FROM favourites
+        GROUP BY book_id
+    ) AS f ON f.book_id = b.id
+    WITH DATA
+    """,
+    "CREATE UNIQUE INDEX ux_book_stats_book_id ON book_stats (book_id)",
+    "CREATE INDEX ix_book_stats_top ON book_stats (avg_rating DESC, review_count DESC, book_id)",
+    """
+    CREATE MATERIALIZED VIEW top_authors AS
+    SELECT
+        a.id AS author_id,
+        u.username,
+        count(bs.book_id) AS book_count,
+        coalesce(sum(bs.review_count), 0)::bigint AS review_count,
+        coalesce(sum(bs.avg_rating * bs.review_count) / nullif(sum(bs.review_count), 0), 0)::float AS avg_rating,
+        coalesce(sum(bs.favourite_count), 0)::bigint AS favourite_count
+    FROM authors a
+    JOIN users u ON u.id = a.user_id
+    LEFT JOIN book_stats bs ON bs.author_id = a.id
+    GROUP BY a.id, u.username
+    WITH DATA
+    """,
+    "CREATE UNIQUE INDEX ux_top_authors_author_id ON top_authors (author_id)",
+    "CREATE INDEX ix_top_authors_top ON top_authors (review_count DESC, avg_rating DESC, author_id)",
+)
+
+DROP_STATS_VIEWS = (
+    "DROP MATERIALIZED VIEW IF EXISTS top_authors",
+    "DROP MATERIALIZED VIEW IF EXISTS book_stats",
+)
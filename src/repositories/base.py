@@ -1,6 +1,7 @@
-from typing import Type, TypeVar, Generic, Optional, List
+from typing import Type, TypeVar, Generic, Optional, List, AsyncIterator
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, update
+from sqlalchemy import select, delete, update, insert, inspect
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from pydantic import BaseModel
 from src.database import Base
 from src.repositories.mappers.base import DataMapper
@@ -25,44 +26,124 @@ class BaseRepository(Generic[DBModelType, MapperType]):
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    def _schema_columns(self, schema: Type[BaseModel]) -> list:
+        columns = inspect(self.model).column_attrs.keys()
+        return [getattr(self.model, name) for name in schema.model_fields if name in columns]
+
+    # projection-чтения: выбираются только колонки схемы маппера, строки сразу маппятся в pydantic,
+    # ORM-объекты не создаются и не попадают в identity map сессии
+    async def get_one_projected(self, *filters, **filter_by) -> Optional[BaseModel]:
+        stmt = select(*self._schema_columns(self.mapper.schema)).filter(*filters).filter_by(**filter_by)
+        result = await self.session.execute(stmt)
+        row = result.first()
+        return self.mapper.map_to_domain_entity(row) if row is not None else None
+
+    async def get_many_projected(self, *filters, **filter_by) -> List[BaseModel]:
+        stmt = select(*self._schema_columns(self.mapper.schema)).filter(*filters).filter_by(**filter_by)
+        result = await self.session.execute(stmt)
+        return [self.mapper.map_to_domain_entity(row) for row in result.all()]
+
+    async def stream(self, schema: Type[BaseModel], *filters, chunk_size: int = 1000,
+                     **filter_by) -> AsyncIterator[List[BaseModel]]:
+        # server-side cursor: в памяти только текущая пачка строк, ORM-объекты не создаются
+        stmt = (
+            select(*self._schema_columns(schema))
+            .filter(*filters)
+            .filter_by(**filter_by)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream(stmt)
+        async for partition in result.partitions():
+            yield [schema.model_validate(row, from_attributes=True) for row in partition]
+
     async def exists(self, *filters, **filter_by) -> bool:
         stmt = select(self.model.id).filter(*filters).filter_by(**filter_by)
         result = await self.session.execute(stmt)
         return result.first() is not None
 
+    # Репозитории только flush'ат изменения: единственная точка commit — DBManager.commit()
+
     async def create(self, obj):
         if isinstance(obj, self.model):
-            db_obj = obj
-        elif hasattr(obj, "model_dump"):
-            db_obj = self.model(**obj.model_dump())
-        elif isinstance(obj, dict):
-            db_obj = self.model(**obj)
-        else:
-            db_obj = self.model(**obj)
+            self.session.add(obj)
+            await self.session.flush()
+            return obj
 
-        self.session.add(db_obj)
-        await self.session.commit()
-        await self.session.refresh(db_obj)
-        return db_obj
+        data = obj.model_dump() if hasattr(obj, "model_dump") else dict(obj)
+        stmt = insert(self.model).values(**data).returning(self.model)
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
 
-    async def update(self, entity_id, update_data: dict):
-        obj = await self.session.get(self.model, entity_id)
-        if obj is None:
-            return None
+    def _pk_criteria(self, entity_id) -> list:
+        # entity_id: скаляр, кортеж в порядке PK или dict {"book_id": ..., "user_id": ...} для составных ключей
+        if isinstance(entity_id, dict):
+            return [getattr(self.model, key) == value for key, value in entity_id.items()]
+        if not isinstance(entity_id, (tuple, list)):
+            entity_id = (entity_id,)
+        pk_columns = inspect(self.model).primary_key
+        if len(entity_id) != len(pk_columns):
+            raise ValueError(f"{self.model.__name__} primary key has {len(pk_columns)} column(s)")
+        return [column == value for column, value in zip(pk_columns, entity_id)]
 
+    def _column_values(self, update_data) -> dict:
         if hasattr(update_data, "model_dump"):
             update_data = update_data.model_dump(exclude_unset=True)
+        columns = inspect(self.model).column_attrs.keys()
+        return {key: val for key, val in update_data.items() if key in columns}
 
-        for key, val in update_data.items():
-            if hasattr(obj, key):
-                setattr(obj, key, val)
+    async def update_returning(self, entity_id, update_data: dict):
+        criteria = self._pk_criteria(entity_id)
+        values = self._column_values(update_data)
+        if not values:
+            return await self.get_one(*criteria)
 
-        await self.session.commit()
-        await self.session.refresh(obj)
-        return obj
+        # один round-trip: UPDATE ... RETURNING вместо SELECT + UPDATE + SELECT
+        stmt = (
+            update(self.model)
+            .where(*criteria)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(synchronize_session="fetch")
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def update(self, entity_id, update_data: dict):
+        return await self.update_returning(entity_id, update_data)
+
+    # bulk_* работают на уровне Core (executemany, insertmanyvalues в asyncpg) без ORM-объектов;
+    # все строки пачки должны иметь одинаковый набор ключей
+
+    async def bulk_create(self, rows: List[dict]) -> int:
+        if not rows:
+            return 0
+        await self.session.execute(insert(self.model.__table__), rows)
+        return len(rows)
+
+    async def bulk_upsert(self, rows: List[dict], conflict_columns: Optional[List[str]] = None,
+                          update_columns: Optional[List[str]] = None) -> int:
+        if not rows:
+            return 0
+        table = self.model.__table__
+        conflict_columns = conflict_columns or [column.name for column in table.primary_key]
+        if update_columns is None:
+            update_columns = [
+                column.name for column in table.columns
+                if column.name not in conflict_columns and column.computed is None and column.name in rows[0]
+            ]
+
+        stmt = pg_insert(table)
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_columns,
+                set_={name: stmt.excluded[name] for name in update_columns},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+        await self.session.execute(stmt, rows)
+        return len(rows)
 
     async def delete(self, *filters, **filter_by) -> bool:
         stmt = delete(self.model).filter(*filters).filter_by(**filter_by)
         result = await self.session.execute(stmt)
-        await self.session.commit()
         return result.rowcount > 0
@@ -1,16 +1,80 @@
+import re
 import uuid
-from typing import Optional, List
-from sqlalchemy import select
-from src.models import BooksOrm, GenresOrm
+from typing import Optional, List, Tuple, Any
+from datetime import datetime, timezone
+from sqlalchemy import select, delete, exists, tuple_, func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import selectinload, make_transient_to_detached
+from src.models import BooksOrm, GenresOrm, AuthorsOrm, UsersOrm
+from src.models.genres import book_genre
 from src.repositories.base import BaseRepository
-from src.repositories.mappers.entities import BookDataMapper
+from src.repositories.mappers.entities import BookDataMapper, BookDetailDataMapper
+from src.schemas.books import BookRead, BookDetail
+from src.utilis.enums import BookSortEnum
 
 
 class BookRepository(BaseRepository[BooksOrm, BookDataMapper]):
     model = BooksOrm
     mapper = BookDataMapper
 
-    async def create_with_genres(self, title, description, cover_image, file_path, author_id, genre_ids=None):
+    async def get_one(self, *filters, **filter_by) -> Optional[BooksOrm]:
+        stmt = select(BooksOrm).options(selectinload(BooksOrm.genres)).filter(*filters).filter_by(**filter_by)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_many(self, *filters, **filter_by) -> List[BooksOrm]:
+        stmt = select(BooksOrm).options(selectinload(BooksOrm.genres)).filter(*filters).filter_by(**filter_by)
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_detail(self, book_id: uuid.UUID) -> Optional[BookDetail]:
+        # два лёгких запроса по колонкам вместо гидрации BooksOrm + selectin жанров;
+        # краткая карточка автора приходит из того же запроса, что и книга
+        book_stmt = (
+            select(
+                *self._schema_columns(BookRead),
+                UsersOrm.username.label("author_username"),
+                AuthorsOrm.profile_picture.label("author_profile_picture"),
+            )
+            .join(AuthorsOrm, AuthorsOrm.id == BooksOrm.author_id)
+            .join(UsersOrm, UsersOrm.id == AuthorsOrm.user_id)
+            .where(BooksOrm.id == book_id)
+        )
+        row = (await self.session.execute(book_stmt)).first()
+        if row is None:
+            return None
+
+        genres = await self._get_genre_rows(book_id)
+        return BookDetailDataMapper.map_to_domain_entity({
+            **row._mapping,
+            "genres": genres,
+            "author": {
+                "id": row.author_id,
+                "username": row.author_username,
+                "profile_picture": row.author_profile_picture,
+            },
+        })
+
+    async def _get_genre_rows(self, book_id: uuid.UUID) -> list:
+        stmt = (
+            select(GenresOrm.id, GenresOrm.name)
+            .join(book_genre, book_genre.c.genre_id == GenresOrm.id)
+            .where(book_genre.c.book_id == book_id)
+            .order_by(GenresOrm.name)
+        )
+        return (await self.session.execute(stmt)).all()
+
+    async def _attach_genres(self, genres) -> List[GenresOrm]:
+        # genres — уже проверенные жанры (id, name) из GenreCache: объекты присоединяются
+        # к сессии как существующие строки, без SELECT по таблице жанров
+        attached = []
+        for genre in genres:
+            genre_orm = GenresOrm(id=genre.id, name=genre.name)
+            make_transient_to_detached(genre_orm)
+            attached.append(await self.session.merge(genre_orm, load=False))
+        return attached
+
+    async def create_with_genres(self, title, description, cover_image, file_path, author_id, genres=()):
         book = BooksOrm(
             id=uuid.uuid4(),
             title=title,
@@ -18,33 +82,124 @@ class BookRepository(BaseRepository[BooksOrm, BookDataMapper]):
             cover_image=cover_image,
             file_path=file_path,
             author_id=author_id,
+            genres=await self._attach_genres(genres),
         )
 
-        if genre_ids:
-            genres = (
-                await self.session.execute(
-                    select(GenresOrm).where(GenresOrm.id.in_(genre_ids))
-                )
-            ).scalars().all()
-            book.genres = genres
-
         self.session.add(book)
-        await self.session.commit()
-        await self.session.refresh(book)
+        await self.session.flush()
         return book
 
-    async def update_with_genres(self, book: BooksOrm, data: dict, genre_ids=None):
+    async def update_with_genres(self, book: BooksOrm, data: dict, genres=None):
         for key, value in data.items():
             setattr(book, key, value)
 
-        if genre_ids is not None:
-            genres = (
-                await self.session.execute(
-                    select(GenresOrm).where(GenresOrm.id.in_(genre_ids))
-                )
-            ).scalars().all()
-            book.genres = genres
+        if genres is not None:
+            book.genres = await self._attach_genres(genres)
 
-        await self.session.commit()
-        await self.session.refresh(book)
+        await self.session.flush()
         return book
+
+    async def bulk_import(self, books: List[dict], known_genres: set) -> Tuple[int, List[dict]]:
+        # books: dict с полями BookImportRow; строки с несуществующим автором отбрасываются,
+        # жанры не из known_genres игнорируются. Возвращает (импортировано, отброшенные строки)
+        author_ids = {book["author_id"] for book in books}
+        known_authors = set((await self.session.execute(
+            select(AuthorsOrm.id).where(AuthorsOrm.id.in_(author_ids))
+        )).scalars().all())
+
+        rejected = [book for book in books if book["author_id"] not in known_authors]
+        # ON CONFLICT не может затронуть одну строку дважды за запрос: при повторе id побеждает последняя
+        accepted = list({
+            book["id"] or uuid.uuid4(): book for book in books if book["author_id"] in known_authors
+        }.items())
+        now = datetime.now(timezone.utc)
+        book_rows = [
+            {
+                "id": book_id,
+                "title": book["title"],
+                "description": book["description"],
+                "cover_image": book["cover_image"],
+                "file_path": book["file_path"],
+                "author_id": book["author_id"],
+                "upload_date": now,
+            }
+            for book_id, book in accepted
+        ]
+        # повторный импорт с теми же id обновляет книги, не трогая дату загрузки и рейтинг
+        await self.bulk_upsert(
+            book_rows,
+            update_columns=["title", "description", "cover_image", "file_path", "author_id"],
+        )
+
+        # повторный импорт заменяет жанры книги списком из файла (пустой список снимает все жанры)
+        await self.session.execute(
+            delete(book_genre).where(book_genre.c.book_id.in_([book_id for book_id, _ in accepted]))
+        )
+        link_rows = [
+            {"book_id": book_id, "genre_id": genre_id}
+            for book_id, book in accepted
+            for genre_id in book["genre_ids"]
+            if genre_id in known_genres
+        ]
+        if link_rows:
+            await self.session.execute(pg_insert(book_genre).on_conflict_do_nothing(), link_rows)
+        return len(book_rows), rejected
+
+    async def get_author_id(self, book_id: uuid.UUID) -> Optional[uuid.UUID]:
+        result = await self.session.execute(select(BooksOrm.author_id).where(BooksOrm.id == book_id))
+        return result.scalar_one_or_none()
+
+    async def get_page(
+        self,
+        sort: BookSortEnum = BookSortEnum.NEWEST,
+        limit: int = 20,
+        after: Optional[Tuple[Any, uuid.UUID]] = None,
+        genre_id: Optional[uuid.UUID] = None,
+        author_id: Optional[uuid.UUID] = None,
+        min_rating: Optional[float] = None,
+    ) -> Tuple[List[BooksOrm], Optional[Tuple[Any, uuid.UUID]]]:
+        # keyset-пагинация: (sort_column, id) строго меньше последней строки предыдущей страницы
+        sort_column = BooksOrm.rating if sort == BookSortEnum.RATING else BooksOrm.upload_date
+
+        stmt = select(BooksOrm).options(selectinload(BooksOrm.genres))
+        if genre_id is not None:
+            stmt = stmt.where(
+                exists().where(book_genre.c.book_id == BooksOrm.id, book_genre.c.genre_id == genre_id)
+            )
+        if author_id is not None:
+            stmt = stmt.where(BooksOrm.author_id == author_id)
+        if min_rating is not None:
+            stmt = stmt.where(BooksOrm.rating >= min_rating)
+        if after is not None:
+            stmt = stmt.where(tuple_(sort_column, BooksOrm.id) < tuple_(*after))
+
+        stmt = stmt.order_by(sort_column.desc(), BooksOrm.id.desc()).limit(limit + 1)
+        books = (await self.session.execute(stmt)).scalars().all()
+
+        if len(books) <= limit:
+            return books, None
+        books = books[:limit]
+        last = books[-1]
+        return books, (getattr(last, sort_column.key), last.id)
+
+    async def search(self, query: str, limit: int = 20) -> List[BooksOrm]:
+        terms = re.findall(r"\w+", query.lower())
+        if not terms:
+            return []
+
+        # префиксный поиск по tsvector + триграммы по названию для опечаток
+        ts_query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        rank = func.ts_rank_cd(BooksOrm.search_vector, ts_query) + func.similarity(BooksOrm.title, query)
+
+        stmt = (
+            select(BooksOrm)
+            .options(selectinload(BooksOrm.genres))
+            .where(or_(
+                BooksOrm.search_vector.bool_op("@@")(ts_query),
+                BooksOrm.title.bool_op("%")(query),
+            ))
+            .order_by(rank.desc(), BooksOrm.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
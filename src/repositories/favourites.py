@@ -1,5 +1,7 @@
 import uuid
-from sqlalchemy import select, delete
+from typing import List, Set
+from sqlalchemy import select, delete, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from src.models import FavouritesOrm, BooksOrm
 from src.repositories.base import BaseRepository
 from src.repositories.mappers.entities import FavouriteDataMapper
@@ -15,4 +17,13 @@ class FavouriteRepository(BaseRepository[FavouritesOrm, FavouriteDataMapper]):
             FavouritesOrm.book_id == book_id
         )
         result = await self.session.execute(stmt)
-        return result.scalar() is not None
\ No newline at end of file
+        return result.scalar() is not None
+
+    async def get_favourited_book_ids(self, user_id: uuid.UUID, book_ids: List[uuid.UUID]) -> Set[uuid.UUID]:
+        # один запрос по PK (user_id, book_id); = ANY(массив) — один prepared statement для любой длины списка
+        stmt = select(FavouritesOrm.book_id).where(
+            FavouritesOrm.user_id == user_id,
+            FavouritesOrm.book_id == any_(bindparam("book_ids", book_ids, type_=ARRAY(PG_UUID(as_uuid=True)))),
+        )
+        result = await self.session.execute(stmt)
+        return set(result.scalars().all())
\ No newline at end of file
@@ -1,8 +1,22 @@
-from sqlalchemy import select
+from typing import List
+from sqlalchemy import select, func
 from src.models import GenresOrm
+from src.models.genres import book_genre
 from src.repositories.base import BaseRepository
 from src.repositories.mappers.entities import GenreDataMapper
+from src.schemas.genres import GenreWithCount
 
 class GenreRepository(BaseRepository[GenresOrm, GenreDataMapper]):
     model = GenresOrm
     mapper = GenreDataMapper
+
+    async def get_all_with_book_counts(self) -> List[GenreWithCount]:
+        # агрегат по book_genre (индекс по genre_id) вместо загрузки книг каждого жанра
+        stmt = (
+            select(GenresOrm.id, GenresOrm.name, func.count(book_genre.c.book_id).label("books_count"))
+            .outerjoin(book_genre, book_genre.c.genre_id == GenresOrm.id)
+            .group_by(GenresOrm.id)
+            .order_by(GenresOrm.name)
+        )
+        result = await self.session.execute(stmt)
+        return [GenreWithCount.model_validate(row, from_attributes=True) for row in result.all()]
@@ -1,8 +1,10 @@
-from src.models import AuthorsOrm, BooksOrm, FavouritesOrm, GenresOrm, ReviewsOrm, UsersOrm
+from src.models import AuthorsOrm, BooksOrm, FavouritesOrm, GenresOrm, ReviewsOrm, UsersOrm, OutboxOrm
 from src.schemas import AuthorRead, FavouriteRead, GenreRead
 from src.schemas.users import UserInDB
-from src.schemas.books import BookInDB
+from src.schemas.books import BookInDB, BookDetail
 from src.schemas.reviews import ReviewInDB
+from src.schemas.outbox import OutboxEvent
+from src.schemas.stats import BookStatsRead, AuthorStatsRead
 from src.repositories.mappers.base import DataMapper
 
 
@@ -14,6 +16,11 @@ class BookDataMapper(DataMapper):
     db_model = BooksOrm
     schema = BookInDB
 
+# карточка книги с автором: источник предсериализованного JSON в BookPageCache
+class BookDetailDataMapper(DataMapper):
+    db_model = BooksOrm
+    schema = BookDetail
+
 class FavouriteDataMapper(DataMapper):
     db_model = FavouritesOrm
     schema = FavouriteRead
@@ -29,3 +36,14 @@ class ReviewDataMapper(DataMapper):
 class UserDataMapper(DataMapper):
     db_model = UsersOrm
     schema = UserInDB
+
+class OutboxDataMapper(DataMapper):
+    db_model = OutboxOrm
+    schema = OutboxEvent
+
+# read-only: материализованные представления, db_model не задан
+class BookStatsDataMapper(DataMapper):
+    schema = BookStatsRead
+
+class AuthorStatsDataMapper(DataMapper):
+    schema = AuthorStatsRead
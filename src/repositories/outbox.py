@@ -0,0 +1,30 @@
+from typing import List
+from sqlalchemy import select, delete
+from src.models import OutboxOrm
+from src.repositories.base import BaseRepository
+from src.repositories.mappers.entities import OutboxDataMapper
+
+
+class OutboxRepository(BaseRepository[OutboxOrm, OutboxDataMapper]):
+    model = OutboxOrm
+    mapper = OutboxDataMapper
+
+    def add(self, topic: str, payload: dict) -> OutboxOrm:
+        # без commit: событие фиксируется вместе с транзакцией вызывающего кода
+        event = OutboxOrm(topic=topic, payload=payload)
+        self.session.add(event)
+        return event
+
+    async def claim_batch(self, limit: int) -> List[OutboxOrm]:
+        # SKIP LOCKED позволяет нескольким ретрансляторам работать параллельно
+        stmt = (
+            select(OutboxOrm)
+            .order_by(OutboxOrm.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def delete_ids(self, ids: List[int]) -> None:
+        await self.session.execute(delete(OutboxOrm).where(OutboxOrm.id.in_(ids)))
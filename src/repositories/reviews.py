@@ -1,5 +1,8 @@
 import uuid
-from sqlalchemy import select, delete, update
+from collections import defaultdict
+from typing import List, Set
+from sqlalchemy import select, delete, update, case, cast, Float, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from src.models import ReviewsOrm, BooksOrm
 from src.repositories.base import BaseRepository
 from src.repositories.mappers.entities import ReviewDataMapper
@@ -15,4 +18,86 @@ class ReviewRepository(BaseRepository[ReviewsOrm, ReviewDataMapper]):
             ReviewsOrm.user_id == user_id
         )
         result = await self.session.execute(stmt)
-        return result.scalar() is not None
\ No newline at end of file
+        return result.scalar() is not None
+
+    async def get_reviewed_book_ids(self, user_id: uuid.UUID, book_ids: List[uuid.UUID]) -> Set[uuid.UUID]:
+        stmt = select(ReviewsOrm.book_id).where(
+            ReviewsOrm.user_id == user_id,
+            ReviewsOrm.book_id == any_(bindparam("book_ids", book_ids, type_=ARRAY(PG_UUID(as_uuid=True)))),
+        )
+        result = await self.session.execute(stmt)
+        return set(result.scalars().all())
+
+    async def create(self, obj):
+        if isinstance(obj, ReviewsOrm):
+            review = obj
+        elif hasattr(obj, "model_dump"):
+            review = ReviewsOrm(**obj.model_dump())
+        else:
+            review = ReviewsOrm(**obj)
+
+        self.session.add(review)
+        await self.session.flush()
+        await self._apply_rating_delta(review.book_id, review.rating, 1)
+        return review
+
+    async def update(self, entity_id, update_data: dict):
+        values = self._column_values(update_data)
+        if "rating" not in values:
+            return await self.update_returning(entity_id, values)
+
+        # подзапрос FOR UPDATE видит строку до UPDATE: старый рейтинг возвращается тем же запросом
+        old = (
+            select(ReviewsOrm.book_id, ReviewsOrm.user_id, ReviewsOrm.rating)
+            .where(*self._pk_criteria(entity_id))
+            .with_for_update()
+            .subquery("old")
+        )
+        stmt = (
+            update(ReviewsOrm)
+            .where(ReviewsOrm.book_id == old.c.book_id, ReviewsOrm.user_id == old.c.user_id)
+            .values(**values)
+            .returning(ReviewsOrm, old.c.rating)
+            .execution_options(synchronize_session="fetch")
+        )
+        row = (await self.session.execute(stmt)).first()
+        if row is None:
+            return None
+
+        review, old_rating = row
+        if review.rating != old_rating:
+            await self._apply_rating_delta(review.book_id, review.rating - old_rating, 0)
+        return review
+
+    async def delete(self, *filters, **filter_by) -> bool:
+        stmt = (
+            delete(ReviewsOrm)
+            .filter(*filters)
+            .filter_by(**filter_by)
+            .returning(ReviewsOrm.book_id, ReviewsOrm.rating)
+        )
+        rows = (await self.session.execute(stmt)).all()
+
+        deltas = defaultdict(lambda: [0, 0])
+        for book_id, rating in rows:
+            deltas[book_id][0] -= rating
+            deltas[book_id][1] -= 1
+        for book_id, (sum_delta, count_delta) in deltas.items():
+            await self._apply_rating_delta(book_id, sum_delta, count_delta)
+        return len(rows) > 0
+
+    async def _apply_rating_delta(self, book_id: uuid.UUID, sum_delta: int, count_delta: int):
+        # атомарный инкремент в той же транзакции, что и запись отзыва: средняя читается за O(1)
+        new_sum = BooksOrm.rating_sum + sum_delta
+        new_count = BooksOrm.rating_count + count_delta
+        stmt = (
+            update(BooksOrm)
+            .where(BooksOrm.id == book_id)
+            .values(
+                rating_sum=new_sum,
+                rating_count=new_count,
+                rating=case((new_count > 0, cast(new_sum, Float) / new_count), else_=0.0),
+            )
+            .execution_options(synchronize_session="fetch")
+        )
+        await self.session.execute(stmt)
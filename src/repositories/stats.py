@@ -0,0 +1,40 @@
+from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.stats import book_stats, top_authors
+from src.repositories.mappers.entities import BookStatsDataMapper, AuthorStatsDataMapper
+from src.schemas.stats import BookStatsRead, AuthorStatsRead
+
+
+class BookStatsRepository:
+    mapper = BookStatsDataMapper
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_top(self, limit: int = 20, min_reviews: int = 1) -> List[BookStatsRead]:
+        stmt = (
+            select(book_stats)
+            .where(book_stats.c.review_count >= min_reviews)
+            .order_by(book_stats.c.avg_rating.desc(), book_stats.c.review_count.desc(), book_stats.c.book_id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [self.mapper.map_to_domain_entity(row) for row in result.all()]
+
+
+class AuthorStatsRepository:
+    mapper = AuthorStatsDataMapper
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_top(self, limit: int = 20) -> List[AuthorStatsRead]:
+        stmt = (
+            select(top_authors)
+            .order_by(top_authors.c.review_count.desc(), top_authors.c.avg_rating.desc(), top_authors.c.author_id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [self.mapper.map_to_domain_entity(row) for row in result.all()]
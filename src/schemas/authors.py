@@ -16,3 +16,10 @@ class AuthorRead(AuthorBase):
     user_id: UUID4
 
     model_config = {"from_attributes": True}
+
+class AuthorSummary(BaseModel):
+    id: UUID4
+    username: str
+    profile_picture: Optional[str] = None
+
+    model_config = {"from_attributes": True}
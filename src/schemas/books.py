@@ -1,7 +1,8 @@
 from datetime import datetime
 from typing import List, Optional
-from pydantic import BaseModel, UUID4
+from pydantic import BaseModel, Field, UUID4
 
+from src.schemas.authors import AuthorSummary
 from src.schemas.genres import GenreRead
 
 
@@ -28,10 +29,37 @@ class BookRead(BookBase):
     upload_date: datetime
     author_id: UUID4
     rating: float = 0.0
+    rating_count: int = 0
     genres: List[GenreRead] = []
 
     model_config = {"from_attributes": True}
 
+class BookDetail(BookRead):
+    author: AuthorSummary
+
+class BookImportRow(BookBase):
+    # ограничения колонок books: иначе строка падает на INSERT уже всей пачкой (DataError)
+    title: str = Field(min_length=1, max_length=255)
+    description: Optional[str] = Field(None, max_length=5000)
+    cover_image: Optional[str] = Field(None, max_length=500)
+    file_path: str = Field(min_length=1, max_length=1000)
+    id: Optional[UUID4] = None
+    author_id: UUID4
+    genre_ids: List[UUID4] = []
+
+class BookImportResult(BaseModel):
+    imported: int
+    skipped: int
+    errors: List[str] = []
+
+# запрос флагов «в избранном» / «есть мой отзыв» для страницы книг
+class BookStatusRequest(BaseModel):
+    book_ids: List[UUID4] = Field(max_length=200)
+
+class BookPage(BaseModel):
+    items: List[BookRead]
+    next_cursor: Optional[str] = None
+
 class BookInDB(BaseModel):
     id: UUID4
     title: str
@@ -41,6 +69,7 @@ class BookInDB(BaseModel):
     upload_date: datetime
     author_id: UUID4
     rating: float
+    rating_count: int = 0
 
     model_config = {"from_attributes": True}
 
@@ -10,3 +10,6 @@ class GenreRead(GenreBase):
     id: UUID4
 
     model_config = {"from_attributes": True}
+
+class GenreWithCount(GenreRead):
+    books_count: int = 0
@@ -0,0 +1,21 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class PasswordHasherStats(BaseModel):
+    max_workers: int
+    in_flight: int
+    queue_depth: int
+    completed: int
+    avg_queue_wait_ms: float
+
+class DBPoolStats(BaseModel):
+    pool_class: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: Optional[int] = None
+    timeouts: Optional[int] = None
+    avg_wait_ms: Optional[float] = None
+    max_wait_ms: Optional[float] = None
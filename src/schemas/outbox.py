@@ -0,0 +1,11 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class OutboxEvent(BaseModel):
+    id: int
+    topic: str
+    payload: dict
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
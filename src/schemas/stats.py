@@ -0,0 +1,22 @@
+from pydantic import BaseModel, UUID4
+
+
+class BookStatsRead(BaseModel):
+    book_id: UUID4
+    author_id: UUID4
+    title: str
+    review_count: int
+    avg_rating: float
+    favourite_count: int
+
+    model_config = {"from_attributes": True}
+
+class AuthorStatsRead(BaseModel):
+    author_id: UUID4
+    username: str
+    book_count: int
+    review_count: int
+    avg_rating: float
+    favourite_count: int
+
+    model_config = {"from_attributes": True}
@@ -31,6 +31,13 @@ class UserUpdateAdmin(BaseModel):
     role: Optional[RoleEnum] = None
     is_active: Optional[bool] = None
 
+class UserPrincipal(BaseModel):
+    id: UUID4
+    role: RoleEnum
+    is_active: bool
+
+    model_config = {"from_attributes": True}
+
 class UserInDB(BaseModel):
     id: UUID4
     username: str
@@ -1,9 +1,8 @@
-import asyncio
+from sqlalchemy import text
 
-from src.database import async_session_maker_null_pool
-from src.utilis.celery_app import celery_app
-from src.utilis.redis_manager import RedisManager
 from src.config import settings
+from src.utilis.celery_app import celery_app
+from src.utilis.worker_runtime import runtime
 
 
 @celery_app.task
@@ -11,17 +10,18 @@ def refresh_materialized_views():
     print("[Celery] Refreshing materialized views...")
 
     async def _refresh():
-        async with async_session_maker_null_pool() as session:
+        async with runtime.session_maker() as session:
             try:
-                await session.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY book_stats;")
-                await session.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY top_authors;")
+                # top_authors строится поверх book_stats, порядок важен
+                await session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY book_stats;"))
+                await session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY top_authors;"))
                 await session.commit()
                 print("[Celery] Materialized views refreshed successfully")
             except Exception as exc:
                 await session.rollback()
                 print(f"[Celery] Error refreshing materialized views: {exc}")
 
-    asyncio.run(_refresh())
+    runtime.run(_refresh())
 
 
 @celery_app.task
@@ -29,13 +29,12 @@ def cleanup_redis_cache():
 
     async def _cleanup():
         print("[Celery] Starting Redis cache cleanup...")
-        redis = RedisManager(settings.REDIS_HOST, settings.REDIS_PORT)
-        await redis.connect()
+        redis = runtime.redis_manager
 
-        deleted_books = await redis.delete("search:books:*")
-        deleted_tmp = await redis.delete("tmp:*")
+        deleted_books = await redis.delete_pattern("search:books:*", batch_size=settings.REDIS_CLEANUP_BATCH_SIZE)
+        deleted_tmp = await redis.delete_pattern("tmp:*", batch_size=settings.REDIS_CLEANUP_BATCH_SIZE)
 
-        await redis.close()
         print(f"[Celery] Redis cleanup done. Deleted: search={deleted_books}, tmp={deleted_tmp}")
+        return {"search": deleted_books, "tmp": deleted_tmp}
 
-    asyncio.run(_cleanup())
+    return runtime.run(_cleanup())
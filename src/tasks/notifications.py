@@ -1,15 +1,48 @@
-import asyncio
+import json
+import uuid
+from collections import defaultdict
 from email.message import EmailMessage
+from typing import Iterable
 
-from aiosmtplib import SMTP
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import selectinload
 
-from src.database import async_session_maker_null_pool
-from src.models import BooksOrm, AuthorsOrm
+from src.models import BooksOrm, AuthorsOrm, ReviewsOrm, UsersOrm
 from src.utilis.celery_app import celery_app
 from src.config import settings
 from src.utilis.db_manager import DBManager
+from src.utilis.worker_runtime import runtime
+
+
+def render_review_message(author_email: str, author_name: str, reviews: list[dict]) -> EmailMessage:
+    if len(reviews) == 1:
+        review = reviews[0]
+        subject = f"Новый отзыв на вашу книгу «{review['book_title']}»"
+        body = (
+            f"Здравствуйте, {author_name}!\n\n"
+            f"На вашу книгу «{review['book_title']}» оставлен новый отзыв.\n\n"
+            f"Рейтинг: {review['rating']}/5\n"
+            f"Комментарий: {review['text']}\n\n"
+            f"С уважением,\nКоманда Online Library"
+        )
+    else:
+        subject = f"Новые отзывы на ваши книги: {len(reviews)}"
+        items = "\n\n".join(
+            f"«{review['book_title']}» — {review['rating']}/5\n{review['text']}" for review in reviews
+        )
+        body = (
+            f"Здравствуйте, {author_name}!\n\n"
+            f"На ваши книги оставлено новых отзывов: {len(reviews)}.\n\n"
+            f"{items}\n\n"
+            f"С уважением,\nКоманда Online Library"
+        )
+
+    message = EmailMessage()
+    message["From"] = settings.SMTP_FROM
+    message["To"] = author_email
+    message["Subject"] = subject
+    message.set_content(body)
+    return message
 
 
 @celery_app.task(
@@ -20,7 +53,7 @@ from src.utilis.db_manager import DBManager
 def send_notification_to_author(self, book_id: str, user_id: str):
 
     async def _send():
-        async with DBManager(session_factory=async_session_maker_null_pool) as db:
+        async with DBManager(session_factory=runtime.session_maker) as db:
             review = await db.reviews.get_one(book_id=book_id, user_id=user_id)
             if not review:
                 print(f"[Celery] Review not found for book={book_id}, user={user_id}")
@@ -42,43 +75,149 @@ def send_notification_to_author(self, book_id: str, user_id: str):
                 return
 
             author = book.author
-            author_email = author.user.email
-            author_name = getattr(author.user, "username", "Автор")
-
-            subject = f"Новый отзыв на вашу книгу «{book.title}»"
-            body = (
-                f"Здравствуйте, {author_name}!\n\n"
-                f"На вашу книгу «{book.title}» оставлен новый отзыв.\n\n"
-                f"Рейтинг: {review.rating}/5\n"
-                f"Комментарий: {review.text}\n\n"
-                f"С уважением,\nКоманда Online Library"
-            )
+            item = {
+                "author_email": author.user.email,
+                "author_name": getattr(author.user, "username", "Автор"),
+                "book_title": book.title,
+                "rating": review.rating,
+                "text": review.text,
+            }
 
-            message = EmailMessage()
-            message["From"] = settings.SMTP_FROM
-            message["To"] = author_email
-            message["Subject"] = subject
-            message.set_content(body)
-
-            try:
-                smtp = SMTP(
-                    hostname=settings.SMTP_HOST,
-                    port=settings.SMTP_PORT,
-                    use_tls=settings.SMTP_TLS,
-                )
-                await smtp.connect()
-                if settings.SMTP_USER and settings.SMTP_PASSWORD:
-                    await smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        # отзывы копятся в окне NOTIFICATION_COALESCE_SECONDS и уходят автору одним письмом
+        redis = runtime.redis_manager.redis
+        await redis.rpush(f"notifications:queue:{author.id}", json.dumps(item, ensure_ascii=False))
+        scheduled = await redis.set(
+            f"notifications:scheduled:{author.id}", 1, nx=True, ex=settings.NOTIFICATION_COALESCE_SECONDS * 2
+        )
+        if scheduled:
+            flush_author_notifications.apply_async((str(author.id),), countdown=settings.NOTIFICATION_COALESCE_SECONDS)
+
+    runtime.run(_send())
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60
+)
+def flush_author_notifications(self, author_id: str):
+
+    async def _flush():
+        redis = runtime.redis_manager.redis
+        queue_key = f"notifications:queue:{author_id}"
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.lrange(queue_key, 0, -1)
+            pipe.delete(queue_key)
+            pipe.delete(f"notifications:scheduled:{author_id}")
+            raw_items, _, _ = await pipe.execute()
+
+        if not raw_items:
+            return
 
-                await smtp.send_message(message)
-                await smtp.quit()
+        reviews = [json.loads(raw) for raw in raw_items]
+        author_email = reviews[-1]["author_email"]
+        message = render_review_message(author_email, reviews[-1]["author_name"], reviews)
 
-                print(
-                    f"[Celery] Email sent to {author_email} about review (book={book_id}, user={user_id})"
+        try:
+            await runtime.smtp_pool.send_many([message])
+            print(f"[Celery] Email sent to {author_email} about {len(reviews)} review(s) (author={author_id})")
+        except Exception as exc:
+            print(f"[Celery] Failed to send email: {exc}")
+            # возвращаем пачку в начало очереди, чтобы не потерять её при повторе
+            await redis.lpush(queue_key, *reversed(raw_items))
+            raise self.retry(exc=exc)
+
+    runtime.run(_flush())
+
+
+DIGEST_AUTHORS_KEY = "notifications:digest:authors"
+
+
+def _digest_stream_key(author_id) -> str:
+    return f"notifications:digest:{author_id}"
+
+
+async def add_to_review_digest(redis, reviews: Iterable[tuple]):
+    # reviews: (author_id, book_id, user_id)
+    async with redis.pipeline(transaction=False) as pipe:
+        for author_id, book_id, user_id in reviews:
+            pipe.xadd(_digest_stream_key(author_id), {"book_id": str(book_id), "user_id": str(user_id)})
+            pipe.sadd(DIGEST_AUTHORS_KEY, str(author_id))
+        await pipe.execute()
+
+
+@celery_app.task
+def send_review_digests():
+
+    async def _send_digests():
+        redis = runtime.redis_manager.redis
+        author_ids = [author_id.decode() for author_id in await redis.smembers(DIGEST_AUTHORS_KEY)]
+        if not author_ids:
+            return
+
+        # автор снимается с учёта до чтения stream: отзывы, пришедшие позже, вернут его в множество.
+        # Кто не дошёл до успешной отправки (ошибка Redis, БД или SMTP), возвращается в finally
+        await redis.srem(DIGEST_AUTHORS_KEY, *author_ids)
+        pending = set(author_ids)
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for author_id in author_ids:
+                    pipe.xrange(_digest_stream_key(author_id))
+                streams = dict(zip(author_ids, await pipe.execute()))
+
+            pairs = {
+                (uuid.UUID(fields[b"book_id"].decode()), uuid.UUID(fields[b"user_id"].decode()))
+                for entries in streams.values()
+                for _, fields in entries
+            }
+            rows = []
+            if pairs:
+                # одна выборка на все отзывы интервала вместо трёх запросов на каждый
+                stmt = (
+                    select(
+                        BooksOrm.author_id,
+                        BooksOrm.title,
+                        ReviewsOrm.rating,
+                        ReviewsOrm.text,
+                        UsersOrm.email,
+                        UsersOrm.username,
+                    )
+                    .join(BooksOrm, BooksOrm.id == ReviewsOrm.book_id)
+                    .join(AuthorsOrm, AuthorsOrm.id == BooksOrm.author_id)
+                    .join(UsersOrm, UsersOrm.id == AuthorsOrm.user_id)
+                    .where(tuple_(ReviewsOrm.book_id, ReviewsOrm.user_id).in_(list(pairs)))
+                    .order_by(BooksOrm.author_id, ReviewsOrm.created_at)
                 )
-            except Exception as exc:
-                print(f"[Celery] Failed to send email: {exc}")
-                raise self.retry(exc=exc)
+                async with runtime.session_maker() as session:
+                    rows = (await session.execute(stmt)).all()
+
+            per_author = defaultdict(list)
+            recipients = {}
+            for row in rows:
+                per_author[str(row.author_id)].append({"book_title": row.title, "rating": row.rating, "text": row.text})
+                recipients[str(row.author_id)] = (row.email, row.username)
+
+            # письма по одному: при сбое SMTP на середине повторно отправятся только неотправленные
+            failed = set()
+            for author_id, reviews in per_author.items():
+                message = render_review_message(recipients[author_id][0], recipients[author_id][1], reviews)
+                try:
+                    await runtime.smtp_pool.send_many([message])
+                except Exception as exc:
+                    print(f"[Celery] Failed to send review digest (author={author_id}): {exc}")
+                    failed.add(author_id)
 
+            # у остальных авторов дайджест доставлен или отзывы уже удалены — их записи больше не нужны
+            delivered = [author_id for author_id in author_ids if author_id not in failed]
+            async with redis.pipeline(transaction=False) as pipe:
+                for author_id in delivered:
+                    if streams[author_id]:
+                        pipe.xdel(_digest_stream_key(author_id), *[entry_id for entry_id, _ in streams[author_id]])
+                await pipe.execute()
+            pending -= set(delivered)
+            print(f"[Celery] Review digests sent: {len(per_author) - len(failed)} email(s), failed: {len(failed)}")
+        finally:
+            if pending:
+                await redis.sadd(DIGEST_AUTHORS_KEY, *pending)
 
-    asyncio.run(_send())
+    runtime.run(_send_digests())
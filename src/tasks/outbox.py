@@ -0,0 +1,55 @@
+from src.config import settings
+from src.tasks.notifications import send_notification_to_author, add_to_review_digest
+from src.utilis.celery_app import celery_app
+from src.utilis.db_manager import DBManager
+from src.utilis.worker_runtime import runtime
+
+
+async def _publish_review_created(events):
+    if settings.NOTIFICATION_MODE == "digest":
+        await add_to_review_digest(
+            runtime.redis_manager.redis,
+            [(event.payload["author_id"], event.payload["book_id"], event.payload["user_id"]) for event in events],
+        )
+        return
+
+    # одно соединение с брокером на всю пачку
+    with celery_app.producer_or_acquire() as producer:
+        for event in events:
+            send_notification_to_author.apply_async(
+                (event.payload["book_id"], event.payload["user_id"]), producer=producer
+            )
+
+
+async def relay_pending(session_factory) -> int:
+    # пачка удаляется только после успешной публикации; при ошибке строки остаются и уйдут повторно
+    relayed = 0
+    while True:
+        async with DBManager(session_factory=session_factory) as db:
+            events = await db.outbox.claim_batch(settings.OUTBOX_BATCH_SIZE)
+            if not events:
+                break
+
+            review_created = [event for event in events if event.topic == "review.created"]
+            if review_created:
+                await _publish_review_created(review_created)
+
+            await db.outbox.delete_ids([event.id for event in events])
+            await db.commit()
+            relayed += len(events)
+
+        if len(events) < settings.OUTBOX_BATCH_SIZE:
+            break
+    return relayed
+
+
+@celery_app.task
+def relay_outbox():
+
+    async def _relay():
+        # session_maker появляется только после runtime.start() внутри run()
+        return await relay_pending(runtime.session_maker)
+
+    relayed = runtime.run(_relay())
+    if relayed:
+        print(f"[Celery] Outbox relayed: {relayed} event(s)")
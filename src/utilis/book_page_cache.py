@@ -0,0 +1,44 @@
+import hashlib
+import uuid
+from typing import Optional, Tuple
+
+from src.utilis.db_manager import DBManager
+from src.utilis.tag_cache import TagCache
+
+
+# Карточка книги хранится готовыми байтами ответа вместе с ETag: "<etag>\n<json>".
+# Горячее чтение — один GET в Redis без pydantic и без БД.
+class BookPageCache:
+    def __init__(self, tag_cache: TagCache, session_factory, expire: int):
+        self.tag_cache = tag_cache
+        self.session_factory = session_factory
+        self.expire = expire
+
+    @staticmethod
+    def _key(book_id) -> str:
+        return f"books:{book_id}"
+
+    async def get(self, book_id: uuid.UUID) -> Optional[Tuple[str, bytes]]:
+        cached = await self.tag_cache.get(self._key(book_id))
+        if cached is None:
+            return None
+        etag, _, body = cached.partition(b"\n")
+        return etag.decode(), body
+
+    async def build(self, db: DBManager, book_id: uuid.UUID) -> Optional[Tuple[str, bytes]]:
+        since = await self.tag_cache.begin()
+        book = await db.books.get_detail(book_id)
+        if book is None:
+            return None
+
+        body = book.model_dump_json().encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        tags = [f"book:{book.id}", f"author:{book.author_id}", *(f"genre:{genre.id}" for genre in book.genres)]
+        await self.tag_cache.set(self._key(book_id), etag.encode() + b"\n" + body, tags=tags, expire=self.expire,
+                                 since=since)
+        return etag, body
+
+    async def rebuild(self, book_id: uuid.UUID):
+        # фоновая пересборка после записи: собственная сессия, сессия запроса к этому моменту закрыта
+        async with DBManager(session_factory=self.session_factory) as db:
+            await self.build(db, book_id)
@@ -10,6 +10,7 @@ celery_app = Celery(
     include=[
         "src.tasks.notifications",
         "src.tasks.maintenance",
+        "src.tasks.outbox",
     ],
 )
 
@@ -22,4 +23,12 @@ celery_app.conf.beat_schedule = {
         "task": "src.tasks.maintenance.cleanup_redis_cache",
         "schedule": timedelta(hours=1),
     },
+    "relay-outbox": {
+        "task": "src.tasks.outbox.relay_outbox",
+        "schedule": timedelta(seconds=settings.OUTBOX_RELAY_SECONDS),
+    },
+    "send-review-digests": {
+        "task": "src.tasks.notifications.send_review_digests",
+        "schedule": timedelta(minutes=settings.NOTIFICATION_DIGEST_MINUTES),
+    },
 }
\ No newline at end of file
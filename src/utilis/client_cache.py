@@ -0,0 +1,86 @@
+import asyncio
+from typing import Any, Iterable, Optional
+
+from redis.asyncio import Connection
+
+from src.utilis.lru_cache import LRUCache
+
+
+# Клиентский кэш значений Redis (RESP3 client tracking, режим BCAST).
+# Отдельное соединение подписывается на изменения ключей с заданными префиксами и
+# получает push-сообщения invalidate; пока соединение живо, локальная копия актуальна.
+# При обрыве кэш сбрасывается и не используется до переподключения, ttl — страховка.
+class ClientSideCache:
+    def __init__(self, host: str, port: int, prefixes: Iterable[str], maxsize: int, ttl: float,
+                 reconnect_delay: float = 1.0):
+        self.host = host
+        self.port = port
+        self.prefixes = tuple(prefixes)
+        self.local = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.reconnect_delay = reconnect_delay
+        self.active = False
+        # растёт на каждое сообщение invalidate: значение, прочитанное до него, не кладём в кэш
+        self.epoch = 0
+        self._listener: Optional[asyncio.Task] = None
+
+    def tracks(self, key: str) -> bool:
+        return self.active and key.startswith(self.prefixes)
+
+    def get(self, key: str) -> Any:
+        return self.local.get(key)
+
+    def set(self, key: str, value: Any, epoch: int) -> None:
+        if value is not None and self.active and epoch == self.epoch:
+            self.local.set(key, value)
+
+    async def start(self):
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self._deactivate()
+
+    def _deactivate(self):
+        self.active = False
+        self.epoch += 1
+        self.local.clear()
+
+    async def _on_invalidate(self, message):
+        # message: [b"invalidate", [key, ...]] или [b"invalidate", None] после FLUSHALL/FLUSHDB
+        self.epoch += 1
+        keys = message[1]
+        if keys is None:
+            self.local.clear()
+            return
+        for key in keys:
+            self.local.delete(key.decode() if isinstance(key, bytes) else key)
+
+    async def _listen(self):
+        while True:
+            connection = Connection(host=self.host, port=self.port, protocol=3, socket_timeout=None)
+            try:
+                await connection.connect()
+                # после connect соединение уже с RESP3-парсером
+                connection._parser.set_invalidation_push_handler(self._on_invalidate)
+                args = ["CLIENT", "TRACKING", "ON", "BCAST"]
+                for prefix in self.prefixes:
+                    args += ["PREFIX", prefix]
+                await connection.send_command(*args)
+                await connection.read_response()
+                self.active = True
+                while True:
+                    await connection.read_response(push_request=True)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._deactivate()
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                await connection.disconnect()
@@ -4,6 +4,8 @@ from src.repositories.books import BookRepository
 from src.repositories.favourites import FavouriteRepository
 from src.repositories.genres import GenreRepository
 from src.repositories.reviews import ReviewRepository
+from src.repositories.outbox import OutboxRepository
+from src.repositories.stats import BookStatsRepository, AuthorStatsRepository
 
 class DBManager:
     def __init__(self, session_factory):
@@ -18,6 +20,9 @@ class DBManager:
         self.favourites = FavouriteRepository(self.session)
         self.genres = GenreRepository(self.session)
         self.reviews = ReviewRepository(self.session)
+        self.outbox = OutboxRepository(self.session)
+        self.book_stats = BookStatsRepository(self.session)
+        self.author_stats = AuthorStatsRepository(self.session)
 
         return self
 
@@ -26,4 +31,7 @@ class DBManager:
         await self.session.close()
 
     async def commit(self):
-        await self.session.commit()
\ No newline at end of file
+        await self.session.commit()
+
+    async def rollback(self):
+        await self.session.rollback()
\ No newline at end of file
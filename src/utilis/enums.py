@@ -4,4 +4,8 @@ import enum
 class RoleEnum(str, enum.Enum):
     ADMIN = "admin"
     AUTHOR = "author"
-    USER = "user"
\ No newline at end of file
+    USER = "user"
+
+class BookSortEnum(str, enum.Enum):
+    NEWEST = "newest"
+    RATING = "rating"
@@ -0,0 +1,136 @@
+import asyncio
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError
+
+from src.schemas.genres import GenreWithCount
+from src.utilis.lru_cache import LRUCache
+from src.utilis.redis_manager import RedisManager
+
+genres_adapter = TypeAdapter(List[GenreWithCount])
+
+
+class GenreSnapshot(NamedTuple):
+    genres: List[GenreWithCount]
+    by_id: Dict
+
+
+# Таблица жанров целиком: память процесса -> Redis -> Postgres.
+# Изменения жанров публикуются в канал, каждый воркер сбрасывает локальную копию;
+# books_count обновляется не чаще, чем истекает expire (жанры на запись книг не инвалидируются).
+class GenreCache:
+    def __init__(self, redis_manager: RedisManager, local_ttl: float, expire: int,
+                 key: str = "genres:all", channel: str = "genres:invalidate", reconnect_delay: float = 1.0):
+        self.redis_manager = redis_manager
+        # один снимок на процесс: ограничение размера — сам снимок
+        self.local = LRUCache(maxsize=1, ttl=local_ttl)
+        self.expire = expire
+        self.key = key
+        self.version_key = f"{key}:version"
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        # растёт на каждую инвалидацию: снимок, загруженный до неё, в память не кладём
+        self.epoch = 0
+        self._listener: Optional[asyncio.Task] = None
+
+    async def get_all(self, db) -> List[GenreWithCount]:
+        return (await self._snapshot(db)).genres
+
+    async def get_by_ids(self, db, genre_ids: Iterable) -> List[GenreWithCount]:
+        genre_ids = list(dict.fromkeys(genre_ids))
+        by_id = (await self._snapshot(db)).by_id
+        if any(genre_id not in by_id for genre_id in genre_ids):
+            # жанр мог появиться после снимка (сообщение о нём ещё не дошло): один раз перечитываем из БД
+            self._drop_local()
+            by_id = (await self._snapshot(db, refresh=True)).by_id
+        # несуществующие id пропускаются, как и при выборке из БД
+        return [by_id[genre_id] for genre_id in genre_ids if genre_id in by_id]
+
+    async def _snapshot(self, db, refresh: bool = False) -> GenreSnapshot:
+        snapshot = None if refresh else self.local.get(self.key)
+        if snapshot is not None:
+            return snapshot
+
+        epoch = self.epoch
+        genres = None
+        version = None
+        try:
+            async with self.redis_manager.pipeline() as pipe:
+                pipe.get(self.key)
+                pipe.get(self.version_key)
+                cached, version = await pipe.execute()
+            version = int(version or 0)
+            if cached is not None and not refresh:
+                genres = genres_adapter.validate_json(cached)
+        except RedisError:
+            pass
+
+        if genres is None:
+            genres = await db.genres.get_all_with_book_counts()
+            if version is not None:
+                await self._store(genres, version)
+
+        snapshot = GenreSnapshot(genres, {genre.id: genre for genre in genres})
+        if epoch == self.epoch:
+            self.local.set(self.key, snapshot)
+        return snapshot
+
+    async def _store(self, genres: List[GenreWithCount], version: int):
+        # invalidate() поднимает версию: снимок, прочитанный до неё, в Redis не попадёт
+        try:
+            await self.redis_manager.set_if_version(
+                self.key, genres_adapter.dump_json(genres), self.expire, self.version_key, version,
+            )
+        except RedisError:
+            pass
+
+    def _drop_local(self):
+        self.epoch += 1
+        self.local.clear()
+
+    async def invalidate(self):
+        self._drop_local()
+        try:
+            # новая версия отсекает запись снимков, прочитанных из БД до неё
+            async with self.redis_manager.transaction() as pipe:
+                pipe.incr(self.version_key)
+                pipe.delete(self.key)
+                await pipe.execute()
+            await self.redis_manager.redis.publish(self.channel, "1")
+        except RedisError:
+            # остальные воркеры догонят по local_ttl
+            pass
+
+    async def start(self):
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self):
+        while True:
+            pubsub = self.redis_manager.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # пока не были подписаны, сообщения могли потеряться
+                self._drop_local()
+                while True:
+                    # явный timeout: listen() упирался бы в socket_timeout клиента на простое канала
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None:
+                        self._drop_local()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._drop_local()
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                await pubsub.aclose()
@@ -0,0 +1,66 @@
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+
+from src.utilis.redis_manager import RedisManager
+
+
+# Контроль допуска перед bcrypt: не более max_in_flight логинов на процесс одновременно
+# и лимит неудачных попыток на username в Redis (фиксированное окно). Отказ — 429 с Retry-After.
+class LoginLimiter:
+    def __init__(self, redis_manager: RedisManager, max_in_flight: int,
+                 attempts: int, window: int, prefix: str = "login:failures"):
+        self.redis_manager = redis_manager
+        self.max_in_flight = max_in_flight
+        self.attempts = attempts
+        self.window = window
+        self.prefix = prefix
+        self.in_flight = 0
+
+    @staticmethod
+    def _too_many(retry_after: int) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": str(max(retry_after, 1))},
+        )
+
+    def _key(self, username: str) -> str:
+        return f"{self.prefix}:{username.lower()}"
+
+    @asynccontextmanager
+    async def admit(self, username: str):
+        # слот занимается без await между проверкой и инкрементом и держится до конца verify
+        if self.in_flight >= self.max_in_flight:
+            raise self._too_many(1)
+        self.in_flight += 1
+        try:
+            await self._check_failures(username)
+            yield
+        finally:
+            self.in_flight -= 1
+
+    async def _check_failures(self, username: str) -> None:
+        try:
+            async with self.redis_manager.pipeline() as pipe:
+                pipe.get(self._key(username))
+                pipe.ttl(self._key(username))
+                failures, ttl = await pipe.execute()
+        except RedisError:
+            # без Redis остаётся только лимит на процесс
+            return
+
+        if failures is not None and int(failures) >= self.attempts:
+            raise self._too_many(ttl)
+
+    async def record_failure(self, username: str) -> None:
+        # окно открывается первой неудачей: SET NX EX и INCR в одной транзакции
+        key = self._key(username)
+        try:
+            async with self.redis_manager.transaction() as pipe:
+                pipe.set(key, 0, ex=self.window, nx=True)
+                pipe.incr(key)
+                await pipe.execute()
+        except RedisError:
+            pass
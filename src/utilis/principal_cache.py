@@ -0,0 +1,78 @@
+import uuid
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from src.schemas.users import UserPrincipal
+from src.utilis.lru_cache import LRUCache
+from src.utilis.redis_manager import RedisManager
+
+
+# Двухуровневый кэш принципала (id, role, is_active) для get_current_user:
+# локальный LRU воркера с коротким TTL и общий слой в Redis.
+# Недоступность Redis не ломает аутентификацию — просто идём в БД.
+# Заполнение: since = begin(user_id) до чтения из БД, затем set(principal, since):
+# принципал, прочитанный до инвалидации (блокировка, смена роли), в кэш не попадёт.
+class PrincipalCache:
+    def __init__(self, redis_manager: RedisManager, maxsize: int, local_ttl: float, redis_ttl: int,
+                 prefix: str = "auth:principal"):
+        self.redis_manager = redis_manager
+        self.redis_ttl = redis_ttl
+        self.prefix = prefix
+        self.local = LRUCache(maxsize=maxsize, ttl=local_ttl)
+
+    def _key(self, user_id: uuid.UUID) -> str:
+        return f"{self.prefix}:{user_id}"
+
+    def _version_key(self, user_id: uuid.UUID) -> str:
+        return f"{self.prefix}:version:{user_id}"
+
+    async def get(self, user_id: uuid.UUID) -> Optional[UserPrincipal]:
+        principal = self.local.get(user_id)
+        if principal is not None:
+            return principal
+
+        try:
+            raw = await self.redis_manager.get(self._key(user_id))
+        except RedisError:
+            return None
+        if raw is None:
+            return None
+
+        principal = UserPrincipal.model_validate_json(raw)
+        self.local.set(user_id, principal)
+        return principal
+
+    async def begin(self, user_id: uuid.UUID) -> Optional[int]:
+        try:
+            version = await self.redis_manager.get(self._version_key(user_id))
+        except RedisError:
+            return None
+        return int(version or 0)
+
+    async def set(self, principal: UserPrincipal, since: Optional[int]) -> None:
+        if since is not None:
+            try:
+                stored = await self.redis_manager.set_if_version(
+                    self._key(principal.id), principal.model_dump_json(), self.redis_ttl,
+                    self._version_key(principal.id), since,
+                )
+            except RedisError:
+                stored = True
+            if not stored:
+                return
+        # без Redis гонку не отследить: остаётся только локальная копия с коротким TTL
+        self.local.set(principal.id, principal)
+
+    async def invalidate(self, user_id: uuid.UUID) -> None:
+        self.local.delete(user_id)
+        version_key = self._version_key(user_id)
+        try:
+            async with self.redis_manager.transaction() as pipe:
+                pipe.incr(version_key)
+                # версия живёт дольше чтения из БД; после истечения сравнение с since просто не совпадёт
+                pipe.expire(version_key, self.redis_ttl)
+                pipe.delete(self._key(user_id))
+                await pipe.execute()
+        except RedisError:
+            pass
@@ -0,0 +1,125 @@
+import math
+import re
+import uuid
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from redis.exceptions import ConnectionError as RedisConnectionError, RedisError
+
+from src.config import RateLimitPolicy
+from src.security import decode_access_token
+from src.utilis.redis_manager import RedisManager
+
+# KEYS — ключи подходящих политик, ARGV — member запроса и пары (limit, window_ms) в порядке KEYS.
+# Сначала проверяются все окна; запрос учитывается только если проходит каждое из них.
+# Возвращает {1, remaining} или {0, retry_after_ms}.
+SLIDING_WINDOW_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local retry_after = 0
+local remaining = -1
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[i * 2])
+    local window = tonumber(ARGV[i * 2 + 1])
+    redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+    local count = redis.call('ZCARD', key)
+    if count >= limit then
+        local wait = window
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        if oldest[2] then
+            wait = tonumber(oldest[2]) + window - now
+        end
+        if wait > retry_after then
+            retry_after = wait
+        end
+    elseif remaining < 0 or limit - count - 1 < remaining then
+        remaining = limit - count - 1
+    end
+end
+if retry_after > 0 then
+    return {0, retry_after}
+end
+for i, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[1])
+    redis.call('PEXPIRE', key, ARGV[i * 2 + 1])
+end
+return {1, remaining}
+"""
+
+
+class SlidingWindowRateLimiter:
+    def __init__(self, redis_manager: RedisManager, policies: List[RateLimitPolicy], prefix: str = "ratelimit"):
+        self.redis_manager = redis_manager
+        self.policies = [
+            (policy, re.compile(policy.path), {method.upper() for method in policy.methods})
+            for policy in policies
+        ]
+        self.prefix = prefix
+        self._script = None
+
+    def match(self, method: str, path: str) -> List[RateLimitPolicy]:
+        return [
+            policy for policy, pattern, methods in self.policies
+            if (not methods or method in methods) and pattern.fullmatch(path)
+        ]
+
+    def _key(self, policy: RateLimitPolicy, user_id: Optional[str], ip: str) -> str:
+        identity = f"user:{user_id}" if policy.scope == "user" and user_id else f"ip:{ip}"
+        return f"{self.prefix}:{policy.name}:{identity}"
+
+    async def hit(self, policies: List[RateLimitPolicy], user_id: Optional[str], ip: str) -> Tuple[bool, int]:
+        redis = self.redis_manager.redis
+        if redis is None:
+            raise RedisConnectionError("Redis is not connected")
+        # Script сам переключается EVALSHA -> EVAL при NOSCRIPT; привязан к клиенту, поэтому пересоздаётся после reconnect
+        if self._script is None or self._script.registered_client is not redis:
+            self._script = redis.register_script(SLIDING_WINDOW_LUA)
+
+        keys = [self._key(policy, user_id, ip) for policy in policies]
+        args = [uuid.uuid4().hex]
+        for policy in policies:
+            args += [policy.limit, policy.window * 1000]
+        allowed, value = await self._script(keys=keys, args=args)
+        return bool(allowed), int(value)
+
+
+def _user_id(scope) -> Optional[str]:
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            try:
+                return decode_access_token(token).get("user_id")
+            except HTTPException:
+                return None
+    return None
+
+
+class RateLimitMiddleware:
+    def __init__(self, app, limiter: SlidingWindowRateLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        policies = self.limiter.match(scope["method"], scope["path"])
+        if policies:
+            client = scope.get("client")
+            try:
+                allowed, value = await self.limiter.hit(policies, _user_id(scope), client[0] if client else "unknown")
+            except RedisError:
+                # лимитер не должен ронять API: без Redis запросы пропускаются
+                allowed = True
+            if not allowed:
+                response = JSONResponse(
+                    {"detail": "Too many requests"},
+                    status_code=429,
+                    headers={"Retry-After": str(max(math.ceil(value / 1000), 1))},
+                )
+                return await response(scope, receive, send)
+
+        await self.app(scope, receive, send)
@@ -1,17 +1,73 @@
+from typing import Dict, List, Optional
+
 import redis.asyncio as redis
 
+from src.utilis.client_cache import ClientSideCache
+
+# KEYS: ключ, ключ версии; ARGV: значение, expire, версия на момент чтения данных из БД.
+# Если версию подняла инвалидация, данные могли быть прочитаны до её коммита — не записываем.
+SET_IF_VERSION_LUA = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[3] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
 
 class RedisManager:
-    def __init__(self, host: str, port: int):
+    def __init__(self, host: str, port: int, max_connections: Optional[int] = None,
+                 socket_timeout: Optional[float] = None, socket_connect_timeout: Optional[float] = None,
+                 client_cache: Optional[ClientSideCache] = None):
         self.host = host
         self.port = port
+        self.max_connections = max_connections
+        self.socket_timeout = socket_timeout
+        self.socket_connect_timeout = socket_connect_timeout
+        self.client_cache = client_cache
         self.redis = None
+        self._set_if_version = None
 
     async def connect(self):
-        self.redis = await redis.Redis(host=self.host, port=self.port)
+        self.redis = redis.Redis(
+            host=self.host,
+            port=self.port,
+            max_connections=self.max_connections,
+            socket_timeout=self.socket_timeout,
+            socket_connect_timeout=self.socket_connect_timeout,
+        )
+        if self.client_cache:
+            await self.client_cache.start()
 
     async def get(self, key: str):
-        return await self.redis.get(key)
+        cache = self.client_cache
+        if cache is None or not cache.tracks(key):
+            return await self.redis.get(key)
+
+        value = cache.get(key)
+        if value is None:
+            epoch = cache.epoch
+            value = await self.redis.get(key)
+            cache.set(key, value, epoch)
+        return value
+
+    async def mget(self, keys: List[str]) -> list:
+        # один MGET на все ключи, которых нет в клиентском кэше; порядок результата = порядок keys
+        if not keys:
+            return []
+        cache = self.client_cache
+        if cache is None:
+            return await self.redis.mget(keys)
+
+        values = [cache.get(key) if cache.tracks(key) else None for key in keys]
+        missing = [index for index, value in enumerate(values) if value is None]
+        if missing:
+            epoch = cache.epoch
+            fetched = await self.redis.mget([keys[index] for index in missing])
+            for index, value in zip(missing, fetched):
+                values[index] = value
+                if cache.tracks(keys[index]):
+                    cache.set(keys[index], value, epoch)
+        return values
 
     async def set(self, key: str, value: str, expire: int = None):
         if expire:
@@ -19,9 +75,59 @@ class RedisManager:
         else:
             await self.redis.set(key, value)
 
-    async def delete(self, key: str):
-        await self.redis.delete(key)
+    async def mset(self, mapping: Dict[str, str], expire: int = None):
+        if not mapping:
+            return
+        if not expire:
+            await self.redis.mset(mapping)
+            return
+        # у MSET нет TTL: SET EX на каждый ключ, но одним round-trip
+        async with self.pipeline() as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=expire)
+            await pipe.execute()
+
+    async def set_if_version(self, key: str, value, expire: int, version_key: str, version: int) -> bool:
+        # проверка версии и SET атомарны; Script привязан к клиенту, поэтому пересоздаётся после reconnect
+        if self._set_if_version is None or self._set_if_version.registered_client is not self.redis:
+            self._set_if_version = self.redis.register_script(SET_IF_VERSION_LUA)
+        return bool(await self._set_if_version(keys=[key, version_key], args=[value, expire, version]))
+
+    def pipeline(self):
+        # пачка команд за один round-trip без MULTI/EXEC
+        return self.redis.pipeline(transaction=False)
+
+    def transaction(self):
+        # MULTI/EXEC: команды пачки выполняются атомарно
+        return self.redis.pipeline(transaction=True)
+
+    async def delete(self, key: str) -> int:
+        return await self.redis.delete(key)
+
+    async def delete_pattern(self, pattern: str, batch_size: int = 500) -> int:
+        # DEL не понимает шаблоны, а KEYS блокирует Redis: ключи обходятся курсором SCAN,
+        # удаляются пачками по batch_size через UNLINK (память освобождается в фоновом потоке)
+        deleted = 0
+        batch = []
+        async for key in self.redis.scan_iter(match=pattern, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                deleted += await self._unlink_batch(batch)
+                batch = []
+        if batch:
+            deleted += await self._unlink_batch(batch)
+        return deleted
+
+    async def _unlink_batch(self, keys: list) -> int:
+        # по одной O(1)-команде на ключ в одном pipeline: один round-trip, без длинной variadic-команды
+        async with self.pipeline() as pipe:
+            for key in keys:
+                pipe.unlink(key)
+            results = await pipe.execute()
+        return sum(results)
 
     async def close(self):
+        if self.client_cache:
+            await self.client_cache.stop()
         if self.redis:
             await self.redis.close()
\ No newline at end of file
@@ -0,0 +1,76 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from email.message import EmailMessage
+from typing import Iterable, List
+
+from aiosmtplib import SMTP, SMTPException
+
+
+# Переиспользуемые SMTP-сессии: TLS-рукопожатие и login выполняются один раз на соединение,
+# а не на каждое письмо. Соединения, простоявшие дольше max_idle, проверяются NOOP.
+class SMTPPool:
+    def __init__(self, hostname: str, port: int, username: str | None, password: str | None,
+                 use_tls: bool, size: int = 2, max_idle: float = 30.0, smtp_factory=SMTP):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.max_idle = max_idle
+        self.smtp_factory = smtp_factory
+        self._idle: List[tuple[float, SMTP]] = []
+        self._semaphore = asyncio.Semaphore(size)
+
+    async def _open(self) -> SMTP:
+        smtp = self.smtp_factory(hostname=self.hostname, port=self.port, use_tls=self.use_tls)
+        await smtp.connect()
+        if self.username and self.password:
+            await smtp.login(self.username, self.password)
+        return smtp
+
+    @staticmethod
+    async def _discard(smtp: SMTP) -> None:
+        try:
+            await smtp.quit()
+        except (SMTPException, OSError):
+            smtp.close()
+
+    async def _acquire(self) -> SMTP:
+        while self._idle:
+            released_at, smtp = self._idle.pop()
+            if not smtp.is_connected:
+                continue
+            if time.monotonic() - released_at < self.max_idle:
+                return smtp
+            try:
+                await smtp.noop()
+                return smtp
+            except (SMTPException, OSError):
+                await self._discard(smtp)
+        return await self._open()
+
+    @asynccontextmanager
+    async def connection(self):
+        async with self._semaphore:
+            smtp = await self._acquire()
+            try:
+                yield smtp
+            except BaseException:
+                await self._discard(smtp)
+                raise
+            self._idle.append((time.monotonic(), smtp))
+
+    async def send_many(self, messages: Iterable[EmailMessage]) -> int:
+        sent = 0
+        async with self.connection() as smtp:
+            for message in messages:
+                await smtp.send_message(message)
+                sent += 1
+        return sent
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for _, smtp in idle:
+            await self._discard(smtp)
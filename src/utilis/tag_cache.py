@@ -0,0 +1,110 @@
+from typing import Iterable, Optional
+
+from redis.exceptions import RedisError
+
+from src.utilis.redis_manager import RedisManager
+
+# KEYS: счётчик инвалидаций, затем маркеры тегов; ARGV[1] — TTL маркеров.
+# Маркер хранит номер последней инвалидации тега.
+MARK_INVALIDATED_LUA = """
+local clock = redis.call('INCR', KEYS[1])
+for i = 2, #KEYS do
+    redis.call('SET', KEYS[i], clock, 'EX', ARGV[1])
+end
+return clock
+"""
+
+# KEYS: ключ записи, n множеств тегов, n маркеров тегов; ARGV: значение, expire, номер из begin().
+# Если хоть один тег инвалидирован после begin(), данные могли быть прочитаны до коммита — не записываем.
+# Множество тега живёт не меньше самой долгоживущей записи: TTL только продлевается.
+# GT считает ключ без TTL бесконечным, поэтому новому множеству TTL ставит NX (Redis >= 7)
+SET_IF_NOT_INVALIDATED_LUA = """
+local n = (#KEYS - 1) / 2
+local since = tonumber(ARGV[3])
+for i = 1, n do
+    if tonumber(redis.call('GET', KEYS[1 + n + i]) or '0') > since then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+for i = 1, n do
+    redis.call('SADD', KEYS[1 + i], KEYS[1])
+    redis.call('EXPIRE', KEYS[1 + i], ARGV[2], 'NX')
+    redis.call('EXPIRE', KEYS[1 + i], ARGV[2], 'GT')
+end
+return 1
+"""
+
+
+# Каждая запись помечается тегами сущностей (book:<id>, author:<id>, genre:<id>):
+# ключ добавляется в множество тега, инвалидация тега удаляет все зависимые ключи.
+# Заполнение: since = begin() до чтения из БД, затем set(..., since=since).
+# Недоступность Redis не ломает чтения — get/set молча пропускаются, данные берутся из БД.
+class TagCache:
+    def __init__(self, redis_manager: RedisManager, prefix: str = "cache", marker_ttl: int = 10 * 60):
+        self.redis_manager = redis_manager
+        self.prefix = prefix
+        # маркер должен пережить самое долгое чтение между begin() и set()
+        self.marker_ttl = marker_ttl
+        self._scripts = {}
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    def _marker_key(self, tag: str) -> str:
+        return f"{self.prefix}:invalidated:{tag}"
+
+    def _clock_key(self) -> str:
+        return f"{self.prefix}:invalidations"
+
+    def _script(self, source: str):
+        redis = self.redis_manager.redis
+        script = self._scripts.get(source)
+        if script is None or script.registered_client is not redis:
+            script = self._scripts[source] = redis.register_script(source)
+        return script
+
+    async def get(self, key: str):
+        try:
+            return await self.redis_manager.get(self._key(key))
+        except RedisError:
+            return None
+
+    async def begin(self) -> Optional[int]:
+        try:
+            clock = await self.redis_manager.get(self._clock_key())
+        except RedisError:
+            return None
+        return int(clock or 0)
+
+    async def set(self, key: str, value, tags: Iterable[str], expire: int, since: Optional[int]) -> bool:
+        if since is None:
+            return False
+        tags = list(tags)
+        keys = [self._key(key), *(self._tag_key(tag) for tag in tags), *(self._marker_key(tag) for tag in tags)]
+        try:
+            return bool(await self._script(SET_IF_NOT_INVALIDATED_LUA)(keys=keys, args=[value, expire, since]))
+        except RedisError:
+            return False
+
+    async def invalidate(self, *tags: str) -> int:
+        if not tags:
+            return 0
+        # сначала маркеры: set(), начатый до этого момента, уже не запишет старые данные
+        await self._script(MARK_INVALIDATED_LUA)(
+            keys=[self._clock_key(), *(self._marker_key(tag) for tag in tags)],
+            args=[self.marker_ttl],
+        )
+
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        async with self.redis_manager.pipeline() as pipe:
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members = await pipe.execute()
+
+        keys = set().union(*members)
+        await self.redis_manager.redis.unlink(*keys, *tag_keys)
+        return len(keys)
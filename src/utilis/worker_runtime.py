@@ -0,0 +1,78 @@
+import asyncio
+
+from celery.signals import worker_process_init, worker_process_shutdown
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.config import settings
+from src.database import build_engine
+from src.utilis.redis_manager import RedisManager
+from src.utilis.smtp_pool import SMTPPool
+
+
+# Event loop, пул соединений с БД, клиент Redis и SMTP-сессии живут всё время жизни процесса воркера
+# (prefork/solo), а не создаются заново в каждой задаче через asyncio.run().
+class WorkerRuntime:
+    def __init__(self):
+        self.loop = None
+        self.engine = None
+        self.session_maker = None
+        self.redis_manager = None
+        self.smtp_pool = None
+
+    def start(self):
+        if self.loop is not None:
+            return
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.engine = build_engine(
+            pool_size=settings.CELERY_DB_POOL_SIZE,
+            max_overflow=settings.CELERY_DB_MAX_OVERFLOW,
+        )
+        self.session_maker = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+        self.redis_manager = RedisManager(
+            settings.REDIS_HOST,
+            settings.REDIS_PORT,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        )
+        self.loop.run_until_complete(self.redis_manager.connect())
+        self.smtp_pool = SMTPPool(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            username=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+            use_tls=settings.SMTP_TLS,
+            size=settings.SMTP_POOL_SIZE,
+        )
+
+    def stop(self):
+        if self.loop is None:
+            return
+        self.loop.run_until_complete(self.smtp_pool.close())
+        self.loop.run_until_complete(self.redis_manager.close())
+        self.loop.run_until_complete(self.engine.dispose())
+        self.loop.close()
+        self.loop = None
+        self.engine = None
+        self.session_maker = None
+        self.redis_manager = None
+        self.smtp_pool = None
+
+    def run(self, coro):
+        # вне воркера (solo-пул, eager-режим, скрипты) инициализируемся лениво
+        self.start()
+        return self.loop.run_until_complete(coro)
+
+
+runtime = WorkerRuntime()
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    runtime.stop()
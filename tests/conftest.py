@@ -1,15 +1,33 @@
 import pytest
 
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import text
 
 from src.config import settings
 from src.database import Base, engine_null_pool, async_session_maker_null_pool
-from src.dependencies.deps import get_db
+from src.dependencies.deps import get_db, get_session_factory
+from src.init import redis_manager
 from src.main import app
 from src.models import *
+from src.models.stats import CREATE_STATS_VIEWS, DROP_STATS_VIEWS
 from src.utilis.db_manager import DBManager
 
 
+def pytest_addoption(parser):
+    parser.addoption("--run-benchmark", action="store_true", default=False, help="run tests marked benchmark")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmark: run with --run-benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 @pytest.fixture(scope="session", autouse=True)
 def check_test_mode():
     assert settings.MODE == "TEST"
@@ -26,12 +44,27 @@ async def db() -> DBManager:
 app.dependency_overrides[get_db] = (
     get_db_null_pool
 )
+app.dependency_overrides[get_session_factory] = lambda: async_session_maker_null_pool
 
 @pytest.fixture(scope="session", autouse=True)
 async def setup_database(check_test_mode):
     async with engine_null_pool.begin() as conn:
+        # представления зависят от таблиц и не входят в Base.metadata
+        for statement in DROP_STATS_VIEWS:
+            await conn.execute(text(statement))
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
+        for statement in CREATE_STATS_VIEWS:
+            await conn.execute(text(statement))
+
+@pytest.fixture(scope="session", autouse=True)
+async def setup_redis(check_test_mode):
+    # ASGITransport не запускает lifespan приложения: Redis и fastapi-cache подключаются здесь
+    await redis_manager.connect()
+    await redis_manager.redis.flushdb()
+    FastAPICache.init(RedisBackend(redis_manager.redis), prefix="fastapi-cache")
+    yield
+    await redis_manager.close()
 
 @pytest.fixture(scope="session")
 async def ac() -> AsyncClient:
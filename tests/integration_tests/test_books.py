@@ -1,7 +1,10 @@
+import json
 from httpx import AsyncClient
 import uuid
+from src.init import redis_manager
 from src.security import hash_password
 from src.utilis.enums import RoleEnum
+from src.utilis.pagination import encode_cursor
 
 
 async def test_books_crud(ac: AsyncClient, db):
@@ -30,6 +33,7 @@ async def test_books_crud(ac: AsyncClient, db):
         "role": RoleEnum.ADMIN,
         "is_active": True,
     })
+    await db.commit()
 
     token_resp = await ac.post(
         "/auth/token",
@@ -58,6 +62,29 @@ async def test_books_crud(ac: AsyncClient, db):
     resp = await ac.get(f"/books/{book_id}", headers=headers_user)
     assert resp.status_code == 200
     assert resp.json()["id"] == book_id
+    assert resp.json()["author"]["username"] == "booker"
+    etag = resp.headers["etag"]
+
+    resp = await ac.get(f"/books/{book_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+    resp = await ac.patch("/users/me", json={"username": "booker_renamed"}, headers=headers_user)
+    assert resp.status_code == 200
+    resp = await ac.get(f"/books/{book_id}")
+    assert resp.json()["author"]["username"] == "booker_renamed"
+
+    resp = await ac.get("/books", params={"author_id": author_id, "genre_id": genre_id, "limit": 1})
+    assert resp.status_code == 200
+    page = resp.json()
+    assert [b["id"] for b in page["items"]] == [book_id]
+    assert page["next_cursor"] is None
+
+    resp = await ac.get("/books", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+
+    resp = await ac.get("/books", params={"cursor": encode_cursor([1, 2])})
+    assert resp.status_code == 400
 
     resp = await ac.put(f"/books/{book_id}", json={
         "title": "Updated Book",
@@ -71,3 +98,97 @@ async def test_books_crud(ac: AsyncClient, db):
     resp = await ac.delete(f"/books/{book_id}", headers=headers_user)
     assert resp.status_code == 204
 
+    ndjson = "\n".join([
+        json.dumps({"title": "Bulk 1", "file_path": "uploads/b1.pdf", "author_id": author_id, "genre_ids": [genre_id]}),
+        json.dumps({"title": "Bulk 2", "file_path": "uploads/b2.pdf", "author_id": str(uuid.uuid4())}),
+        "not json",
+    ])
+    resp = await ac.post("/books/bulk", files={"file": ("books.ndjson", ndjson)}, headers=headers_admin)
+    assert resp.status_code == 200
+    result = resp.json()
+    assert result["imported"] == 1
+    assert result["skipped"] == 2
+
+    csv_content = f"title,file_path,author_id,genre_ids\nBulk 3,uploads/b3.pdf,{author_id},{genre_id}\n"
+    resp = await ac.post("/books/bulk?format=csv", files={"file": ("books.csv", csv_content)}, headers=headers_admin)
+    assert resp.json()["imported"] == 1
+
+    bad_content = "\n".join([
+        json.dumps({"title": "x" * 300, "file_path": "uploads/long.pdf", "author_id": author_id}),
+        "",
+    ]).encode() + b"\xff\xfe\n"
+    resp = await ac.post("/books/bulk", files={"file": ("books.ndjson", bad_content)}, headers=headers_admin)
+    assert resp.status_code == 200
+    assert resp.json()["imported"] == 0
+    assert resp.json()["skipped"] == 2
+
+    reimport_id = str(uuid.uuid4())
+    csv_content = f"id,title,file_path,author_id,genre_ids\n{reimport_id},Bulk 4,uploads/b4.pdf,{author_id},{genre_id}\n"
+    await ac.post("/books/bulk?format=csv", files={"file": ("books.csv", csv_content)}, headers=headers_admin)
+    csv_content = f"id,title,file_path,author_id,genre_ids\n{reimport_id},Bulk 4,uploads/b4.pdf,{author_id},\n"
+    await ac.post("/books/bulk?format=csv", files={"file": ("books.csv", csv_content)}, headers=headers_admin)
+    resp = await ac.get(f"/books/{reimport_id}")
+    assert resp.json()["genres"] == []
+
+    resp = await ac.post("/books/bulk", files={"file": ("books.ndjson", ndjson)}, headers=headers_user)
+    assert resp.status_code == 403
+
+
+
+async def test_books_search(ac: AsyncClient):
+    await ac.post("/auth/register", json={
+        "username": "searcher",
+        "email": "searcher@example.com",
+        "password": "secret123"
+    })
+    token_resp = await ac.post(
+        "/auth/token",
+        data={"username": "searcher", "password": "secret123"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
+    headers = {"Authorization": f"Bearer {token_resp.json()['access_token']}"}
+    resp = await ac.post("/authors/", json={"bio": "Search author", "profile_picture": None}, headers=headers)
+    author_id = resp.json()["id"]
+
+    book_ids = {}
+    for title, description in [
+        ("Quixotic Lighthouse", "Keeper's diary"),
+        ("Harbour Notes", "A quixotic lighthouse story told from the harbour"),
+        ("Quixotic", None),
+    ]:
+        resp = await ac.post("/books/", json={
+            "title": title,
+            "description": description,
+            "file_path": "uploads/search.pdf",
+            "author_id": author_id,
+            "genre_ids": [],
+        }, headers=headers)
+        assert resp.status_code == 201
+        book_ids[title] = resp.json()["id"]
+
+    # точное совпадение по названию ранжируется выше совпадения только в описании
+    resp = await ac.get("/books/search", params={"q": "Quixotic Lighthouse"})
+    assert resp.status_code == 200
+    found = [book["id"] for book in resp.json()]
+    assert found[0] == book_ids["Quixotic Lighthouse"]
+    assert found.index(book_ids["Quixotic Lighthouse"]) < found.index(book_ids["Harbour Notes"])
+
+    # ключ нормализуется: регистр и пробелы не порождают отдельных записей, второй запрос — из кэша
+    assert await redis_manager.redis.exists("search:books:20:quixotic lighthouse")
+    resp = await ac.get("/books/search", params={"q": "  QUIXOTIC   lighthouse "})
+    assert [book["id"] for book in resp.json()] == found
+
+    # опечатка: tsquery не совпадает, находит триграммный поиск по названию
+    resp = await ac.get("/books/search", params={"q": "quixotik"})
+    assert resp.status_code == 200
+    assert resp.json()[0]["id"] == book_ids["Quixotic"]
+
+    resp = await ac.get("/books/search", params={"q": ""})
+    assert resp.status_code == 422
+
+    # запись книги сбрасывает закэшированную выдачу
+    resp = await ac.delete(f"/books/{book_ids['Harbour Notes']}", headers=headers)
+    assert resp.status_code == 204
+    assert not await redis_manager.redis.exists("search:books:20:quixotic lighthouse")
+    resp = await ac.get("/books/search", params={"q": "quixotic lighthouse"})
+    assert book_ids["Harbour Notes"] not in [book["id"] for book in resp.json()]
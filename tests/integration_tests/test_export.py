@@ -0,0 +1,38 @@
+import json
+from httpx import AsyncClient
+import uuid
+from src.security import hash_password
+from src.utilis.enums import RoleEnum
+
+
+async def test_export_users(ac: AsyncClient, db):
+    await db.users.create({
+        "id": uuid.uuid4(),
+        "username": "exporter",
+        "email": "exporter@example.com",
+        "hashed_password": hash_password("adminpass"),
+        "role": RoleEnum.ADMIN,
+        "is_active": True,
+    })
+    await db.commit()
+
+    token_resp = await ac.post(
+        "/auth/token",
+        data={"username": "exporter", "password": "adminpass"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
+    token = token_resp.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = await ac.get("/export/users", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    users = [json.loads(line) for line in resp.text.splitlines()]
+    assert any(u["username"] == "exporter" for u in users)
+    assert all("hashed_password" not in u for u in users)
+
+    resp = await ac.get("/export/users", params={"format": "csv"}, headers=headers)
+    assert resp.status_code == 200
+    lines = resp.text.splitlines()
+    assert lines[0] == "id,username,email,is_active,role"
+    assert any(",exporter," in line for line in lines[1:])
@@ -38,5 +38,13 @@ async def test_crud_favourite(ac: AsyncClient):
     favourites = resp.json()
     assert any(f["book_id"] == book_id for f in favourites)
 
+    other_book_id = "0b9f3c1e-8a4d-4b6e-9c2f-1d7a5e3b8c40"
+    resp = await ac.post("/favourites/status", json={"book_ids": [book_id, other_book_id]}, headers=headers)
+    assert resp.status_code == 200
+    assert resp.json() == {book_id: True, other_book_id: False}
+
+    resp = await ac.post("/reviews/status", json={"book_ids": [book_id]}, headers=headers)
+    assert resp.json() == {book_id: False}
+
     resp = await ac.delete(f"/favourites/{book_id}", headers=headers)
     assert resp.status_code == 204
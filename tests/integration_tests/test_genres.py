@@ -13,6 +13,7 @@ async def test_genres_crud_as_admin(ac: AsyncClient, db):
         "role": RoleEnum.ADMIN,
         "is_active": True,
     })
+    await db.commit()
 
     token_resp = await ac.post(
         "/auth/token",
@@ -28,6 +29,11 @@ async def test_genres_crud_as_admin(ac: AsyncClient, db):
     assert genre["name"] == "Fantasy"
     genre_id = genre["id"]
 
+    resp = await ac.get("/genres")
+    assert resp.status_code == 200
+    listed = next(g for g in resp.json() if g["id"] == genre_id)
+    assert listed["books_count"] == 0
+
     resp = await ac.put(f"/genres/{genre_id}", json={"name": "Epic Fantasy"}, headers=headers)
     assert resp.status_code == 200
     assert resp.json()["name"] == "Epic Fantasy"
@@ -0,0 +1,94 @@
+import uuid
+
+import pytest
+from sqlalchemy import delete, func, select
+
+from src.database import async_session_maker_null_pool
+from src.models import OutboxOrm, ReviewsOrm
+from src.security import hash_password
+from src.tasks import outbox as outbox_tasks
+from src.utilis.db_manager import DBManager
+from src.utilis.enums import RoleEnum
+
+
+async def _create_book(db, username: str):
+    user = await db.users.create({
+        "id": uuid.uuid4(),
+        "username": username,
+        "email": f"{username}@example.com",
+        "hashed_password": hash_password("outboxpass"),
+        "role": RoleEnum.AUTHOR,
+        "is_active": True,
+    })
+    author = await db.authors.create({"id": uuid.uuid4(), "user_id": user.id})
+    book_id = uuid.uuid4()
+    await db.books.bulk_create([
+        {"id": book_id, "title": "Outbox", "file_path": "uploads/outbox.pdf", "author_id": author.id},
+    ])
+    await db.commit()
+    return user, book_id
+
+
+async def _count(db, model, *filters) -> int:
+    return (await db.session.execute(select(func.count()).select_from(model).where(*filters))).scalar_one()
+
+
+async def _add_review_with_event(db, user_id, book_id):
+    await db.reviews.create({"user_id": user_id, "book_id": book_id, "rating": 5, "text": "Outbox"})
+    db.outbox.add("review.created", {"author_id": str(uuid.uuid4()), "book_id": str(book_id), "user_id": str(user_id)})
+
+
+async def test_review_and_outbox_event_share_a_transaction(db):
+    user, book_id = await _create_book(db, "outbox_author")
+    event_filter = OutboxOrm.payload["book_id"].astext == str(book_id)
+
+    await _add_review_with_event(db, user.id, book_id)
+    await db.rollback()
+    assert await _count(db, ReviewsOrm, ReviewsOrm.book_id == book_id) == 0
+    assert await _count(db, OutboxOrm, event_filter) == 0
+
+    await _add_review_with_event(db, user.id, book_id)
+    await db.commit()
+    assert await _count(db, ReviewsOrm, ReviewsOrm.book_id == book_id) == 1
+    assert await _count(db, OutboxOrm, event_filter) == 1
+
+
+async def test_claim_batch_skips_rows_locked_by_another_relay(db):
+    await db.session.execute(delete(OutboxOrm))
+    for i in range(4):
+        db.outbox.add("test.event", {"n": i})
+    await db.commit()
+
+    async with DBManager(session_factory=async_session_maker_null_pool) as first, \
+            DBManager(session_factory=async_session_maker_null_pool) as second:
+        claimed_first = await first.outbox.claim_batch(2)
+        claimed_second = await second.outbox.claim_batch(10)
+
+        assert [event.payload["n"] for event in claimed_first] == [0, 1]
+        assert [event.payload["n"] for event in claimed_second] == [2, 3]
+
+
+async def test_relay_deletes_events_only_after_publish(db, monkeypatch):
+    await db.session.execute(delete(OutboxOrm))
+    await db.commit()
+    user, book_id = await _create_book(db, "relay_author")
+    await _add_review_with_event(db, user.id, book_id)
+    await db.commit()
+
+    async def failing_publish(events):
+        raise ConnectionError("broker is down")
+
+    monkeypatch.setattr(outbox_tasks, "_publish_review_created", failing_publish)
+    with pytest.raises(ConnectionError):
+        await outbox_tasks.relay_pending(async_session_maker_null_pool)
+    assert await _count(db, OutboxOrm) == 1
+
+    published = []
+
+    async def publish(events):
+        published.extend(event.payload["book_id"] for event in events)
+
+    monkeypatch.setattr(outbox_tasks, "_publish_review_created", publish)
+    assert await outbox_tasks.relay_pending(async_session_maker_null_pool) == 1
+    assert published == [str(book_id)]
+    assert await _count(db, OutboxOrm) == 0
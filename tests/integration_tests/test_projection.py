@@ -0,0 +1,87 @@
+import time
+import uuid
+
+import pytest
+
+from src.repositories.mappers.entities import BookDataMapper
+from src.schemas.books import BookInDB
+from src.schemas.favourites import FavouriteRead
+from src.security import hash_password
+from src.utilis.enums import RoleEnum
+
+
+async def test_projection_returns_schema_fields_without_orm_entities(db):
+    user = await db.users.create({
+        "id": uuid.uuid4(),
+        "username": "projection_author",
+        "email": "projection_author@example.com",
+        "hashed_password": hash_password("projpass"),
+        "role": RoleEnum.AUTHOR,
+        "is_active": True,
+    })
+    author = await db.authors.create({"id": uuid.uuid4(), "user_id": user.id})
+    book_ids = [uuid.uuid4() for _ in range(3)]
+    await db.books.bulk_create([
+        {"id": book_id, "title": f"Projection {i}", "file_path": f"uploads/projection_{i}.pdf", "author_id": author.id}
+        for i, book_id in enumerate(book_ids)
+    ])
+    await db.favourites.create({"user_id": user.id, "book_id": book_ids[0]})
+    await db.commit()
+    db.session.expunge_all()
+
+    books = await db.books.get_many_projected(author_id=author.id)
+    assert len(db.session.identity_map) == 0
+    assert all(isinstance(book, BookInDB) for book in books)
+    assert sorted(book.id for book in books) == sorted(book_ids)
+    assert {book.title for book in books} == {"Projection 0", "Projection 1", "Projection 2"}
+    assert all(book.rating == 0.0 and book.rating_count == 0 for book in books)
+
+    favourite = await db.favourites.get_one_projected(user_id=user.id)
+    assert favourite == FavouriteRead(user_id=user.id, book_id=book_ids[0])
+    assert await db.favourites.get_one_projected(user_id=uuid.uuid4()) is None
+    assert len(db.session.identity_map) == 0
+
+
+ROWS = 2000
+ROUNDS = 5
+
+
+# запуск: pytest --run-benchmark -s tests/integration_tests/test_projection.py
+@pytest.mark.benchmark
+async def test_projection_vs_orm_hydration_benchmark(db):
+    user = await db.users.create({
+        "id": uuid.uuid4(),
+        "username": "bench_author",
+        "email": "bench_author@example.com",
+        "hashed_password": hash_password("benchpass"),
+        "role": RoleEnum.AUTHOR,
+        "is_active": True,
+    })
+    author = await db.authors.create({"id": uuid.uuid4(), "user_id": user.id})
+    await db.books.bulk_create([
+        {"id": uuid.uuid4(), "title": f"Bench {i}", "file_path": f"uploads/bench_{i}.pdf", "author_id": author.id}
+        for i in range(ROWS)
+    ])
+    await db.commit()
+
+    # ORM: BooksOrm + selectin жанров + identity map, затем маппинг в схему
+    orm_time = 0.0
+    for _ in range(ROUNDS):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        books = await db.books.get_many(author_id=author.id)
+        orm_result = [BookDataMapper.map_to_domain_entity(book) for book in books]
+        orm_time += time.perf_counter() - start
+
+    db.session.expunge_all()
+    projected_time = 0.0
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        projected_result = await db.books.get_many_projected(author_id=author.id)
+        projected_time += time.perf_counter() - start
+
+    assert len(db.session.identity_map) == 0
+    assert sorted(projected_result, key=lambda b: b.id) == sorted(orm_result, key=lambda b: b.id)
+
+    per_row = lambda total: total / (ROUNDS * ROWS) * 1e6
+    print(f"\nORM hydration: {per_row(orm_time):.1f} us/row, projection: {per_row(projected_time):.1f} us/row")
@@ -0,0 +1,66 @@
+import uuid
+
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+
+from src.config import RateLimitPolicy
+from src.init import redis_manager
+from src.utilis.rate_limit import RateLimitMiddleware, SlidingWindowRateLimiter
+
+POLICIES = [
+    RateLimitPolicy(name="burst", path="/limited", limit=2, window=60, scope="ip"),
+    RateLimitPolicy(name="hourly", limit=10, window=3600, scope="ip"),
+]
+
+
+def make_client(limiter: SlidingWindowRateLimiter) -> AsyncClient:
+    app = FastAPI()
+
+    @app.get("/limited")
+    async def limited():
+        return {"ok": True}
+
+    @app.get("/other")
+    async def other():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+async def test_sliding_window_rejects_over_limit_without_recording_the_hit():
+    prefix = f"ratelimit-test:{uuid.uuid4().hex}"
+    limiter = SlidingWindowRateLimiter(redis_manager, POLICIES, prefix=prefix)
+
+    async with make_client(limiter) as client:
+        for _ in range(2):
+            resp = await client.get("/limited")
+            assert resp.status_code == 200
+
+        resp = await client.get("/limited")
+        assert resp.status_code == 429
+        assert 1 <= int(resp.headers["Retry-After"]) <= 60
+
+        # отказ по burst не учтён ни в одном окне: hourly видит только два принятых запроса
+        ip = "127.0.0.1"
+        assert await redis_manager.redis.zcard(f"{prefix}:burst:ip:{ip}") == 2
+        assert await redis_manager.redis.zcard(f"{prefix}:hourly:ip:{ip}") == 2
+
+        # путь вне burst проверяется только hourly и проходит
+        resp = await client.get("/other")
+        assert resp.status_code == 200
+        assert await redis_manager.redis.zcard(f"{prefix}:hourly:ip:{ip}") == 3
+
+
+async def test_retry_after_is_the_longest_wait_across_policies():
+    prefix = f"ratelimit-test:{uuid.uuid4().hex}"
+    policies = [
+        RateLimitPolicy(name="short", limit=1, window=5, scope="ip"),
+        RateLimitPolicy(name="long", limit=1, window=120, scope="ip"),
+    ]
+    limiter = SlidingWindowRateLimiter(redis_manager, policies, prefix=prefix)
+
+    assert await limiter.hit(policies, None, "10.0.0.1") == (True, 0)
+    allowed, retry_after_ms = await limiter.hit(policies, None, "10.0.0.1")
+    assert not allowed
+    assert 5_000 < retry_after_ms <= 120_000
@@ -37,6 +37,11 @@ async def test_reviews_crud(ac: AsyncClient):
     review = resp.json()
     assert review["rating"] == 5
 
+    resp = await ac.get("/books", params={"author_id": author_id})
+    book = resp.json()["items"][0]
+    assert book["rating"] == 5.0
+    assert book["rating_count"] == 1
+
     resp = await ac.put(f"/reviews/{book_id}", json={
         "rating": 4,
         "text": "Good, but not perfect"
@@ -44,5 +49,13 @@ async def test_reviews_crud(ac: AsyncClient):
     assert resp.status_code == 200
     assert resp.json()["rating"] == 4
 
+    resp = await ac.get("/books", params={"author_id": author_id})
+    assert resp.json()["items"][0]["rating"] == 4.0
+
     resp = await ac.delete(f"/reviews/{book_id}", headers=headers)
     assert resp.status_code == 204
+
+    resp = await ac.get("/books", params={"author_id": author_id})
+    book = resp.json()["items"][0]
+    assert book["rating"] == 0.0
+    assert book["rating_count"] == 0
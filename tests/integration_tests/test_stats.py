@@ -0,0 +1,99 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from src.security import hash_password
+from src.utilis.enums import RoleEnum
+
+
+async def _create_user(db, username: str, role: RoleEnum = RoleEnum.USER):
+    return await db.users.create({
+        "id": uuid.uuid4(),
+        "username": username,
+        "email": f"{username}@example.com",
+        "hashed_password": hash_password("statspass"),
+        "role": role,
+        "is_active": True,
+    })
+
+
+async def test_top_books_and_authors(ac: AsyncClient, db):
+    first_author = await db.authors.create({
+        "id": uuid.uuid4(), "user_id": (await _create_user(db, "stats_author1", RoleEnum.AUTHOR)).id,
+    })
+    second_author = await db.authors.create({
+        "id": uuid.uuid4(), "user_id": (await _create_user(db, "stats_author2", RoleEnum.AUTHOR)).id,
+    })
+    readers = [await _create_user(db, f"stats_reader{i}") for i in range(3)]
+
+    books = {
+        name: uuid.uuid4() for name in ("two_reviews", "one_review", "three_reviews", "no_reviews")
+    }
+    book_authors = {
+        "two_reviews": first_author.id,
+        "one_review": first_author.id,
+        "three_reviews": second_author.id,
+        "no_reviews": first_author.id,
+    }
+    await db.books.bulk_create([
+        {"id": book_id, "title": f"Stats {name}", "file_path": f"uploads/stats_{name}.pdf",
+         "author_id": book_authors[name]}
+        for name, book_id in books.items()
+    ])
+
+    ratings = {
+        "two_reviews": [5, 4],
+        "one_review": [5],
+        "three_reviews": [3, 3, 3],
+    }
+    for name, book_ratings in ratings.items():
+        for reader, rating in zip(readers, book_ratings):
+            await db.reviews.create({"user_id": reader.id, "book_id": books[name], "rating": rating, "text": "Stats"})
+    for reader, name in [(readers[0], "two_reviews"), (readers[1], "two_reviews"), (readers[2], "three_reviews")]:
+        await db.favourites.create({"user_id": reader.id, "book_id": books[name]})
+    await db.commit()
+
+    # как refresh_materialized_views: top_authors строится поверх book_stats
+    await db.session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY book_stats"))
+    await db.session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY top_authors"))
+    await db.commit()
+
+    resp = await ac.get("/stats/books/top", params={"limit": 100, "min_reviews": 1})
+    assert resp.status_code == 200
+    top = [item for item in resp.json() if uuid.UUID(item["book_id"]) in books.values()]
+    assert [uuid.UUID(item["book_id"]) for item in top] == [
+        books["one_review"], books["two_reviews"], books["three_reviews"],
+    ]
+    two_reviews = top[1]
+    assert two_reviews["review_count"] == 2
+    assert two_reviews["avg_rating"] == pytest.approx(4.5)
+    assert two_reviews["favourite_count"] == 2
+    assert two_reviews["author_id"] == str(first_author.id)
+
+    resp = await ac.get("/stats/books/top", params={"limit": 100, "min_reviews": 2})
+    assert resp.status_code == 200
+    top = [uuid.UUID(item["book_id"]) for item in resp.json() if uuid.UUID(item["book_id"]) in books.values()]
+    assert top == [books["two_reviews"], books["three_reviews"]]
+    assert all(item["review_count"] >= 2 for item in resp.json())
+
+    resp = await ac.get("/stats/authors/top", params={"limit": 100})
+    assert resp.status_code == 200
+    authors = {uuid.UUID(item["author_id"]): item for item in resp.json()}
+    ordered = [author_id for author_id in authors if author_id in (first_author.id, second_author.id)]
+    # одинаковое число отзывов: выше автор с большей средней
+    assert ordered == [first_author.id, second_author.id]
+
+    first = authors[first_author.id]
+    assert first["username"] == "stats_author1"
+    assert first["book_count"] == 3
+    assert first["review_count"] == 3
+    assert first["avg_rating"] == pytest.approx(14 / 3)
+    assert first["favourite_count"] == 2
+
+    second = authors[second_author.id]
+    assert second["book_count"] == 1
+    assert second["review_count"] == 3
+    assert second["avg_rating"] == pytest.approx(3.0)
+    assert second["favourite_count"] == 1
@@ -0,0 +1,26 @@
+import uuid
+
+from src.init import tag_cache
+
+
+async def test_set_skips_data_read_before_invalidation():
+    tag = f"author:{uuid.uuid4()}"
+    key = f"authors:{tag}"
+
+    # чтение началось, запись закоммитилась и инвалидировала тег до set
+    since = await tag_cache.begin()
+    await tag_cache.invalidate(tag)
+    assert not await tag_cache.set(key, "stale", tags=[tag], expire=60, since=since)
+    assert await tag_cache.get(key) is None
+
+    since = await tag_cache.begin()
+    assert await tag_cache.set(key, "fresh", tags=[tag], expire=60, since=since)
+    assert await tag_cache.get(key) == b"fresh"
+
+    # инвалидация другого тега не мешает записи
+    since = await tag_cache.begin()
+    await tag_cache.invalidate(f"author:{uuid.uuid4()}")
+    assert await tag_cache.set(key, "fresh", tags=[tag], expire=60, since=since)
+
+    assert await tag_cache.invalidate(tag) == 1
+    assert await tag_cache.get(key) is None
@@ -25,6 +25,7 @@ async def test_users_crud(ac: AsyncClient, db):
         "role": RoleEnum.ADMIN,
         "is_active": True,
     })
+    await db.commit()
     token_resp = await ac.post(
         "/auth/token",
         data={"username": "admin3", "password": "adminpass"},
@@ -56,3 +57,50 @@ async def test_users_crud(ac: AsyncClient, db):
 
     resp = await ac.get(f"/users/{user_id}", headers=headers_admin)
     assert resp.status_code == 404
+
+
+async def test_deactivation_and_deletion_apply_on_next_request(ac: AsyncClient, db):
+    await db.users.create({
+        "id": uuid.uuid4(),
+        "username": "admin_principal",
+        "email": "admin_principal@example.com",
+        "hashed_password": hash_password("adminpass"),
+        "role": RoleEnum.ADMIN,
+        "is_active": True,
+    })
+    await db.commit()
+
+    headers = {}
+    for username in ("admin_principal", "to_deactivate", "to_delete"):
+        if username != "admin_principal":
+            await ac.post("/auth/register", json={
+                "username": username,
+                "email": f"{username}@example.com",
+                "password": "secret123"
+            })
+        password = "adminpass" if username == "admin_principal" else "secret123"
+        token_resp = await ac.post(
+            "/auth/token",
+            data={"username": username, "password": password},
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        headers[username] = {"Authorization": f"Bearer {token_resp.json()['access_token']}"}
+
+    user_ids = {}
+    for username in ("to_deactivate", "to_delete"):
+        # первый запрос кладёт принципал в локальный LRU и Redis
+        user = await db.users.get_one(username=username)
+        user_ids[username] = user.id
+        resp = await ac.get(f"/users/{user.id}", headers=headers[username])
+        assert resp.status_code == 200
+
+    resp = await ac.patch(f"/users/{user_ids['to_deactivate']}", json={"is_active": False},
+                          headers=headers["admin_principal"])
+    assert resp.status_code == 200
+    resp = await ac.get(f"/users/{user_ids['to_deactivate']}", headers=headers["to_deactivate"])
+    assert resp.status_code == 401
+
+    resp = await ac.delete(f"/users/{user_ids['to_delete']}", headers=headers["admin_principal"])
+    assert resp.status_code == 204
+    resp = await ac.get(f"/users/{user_ids['to_delete']}", headers=headers["to_delete"])
+    assert resp.status_code == 401
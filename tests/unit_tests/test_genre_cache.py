@@ -0,0 +1,137 @@
+import uuid
+
+from src.schemas.genres import GenreWithCount
+from src.utilis.genre_cache import GenreCache
+
+
+class FakePipeline:
+    def __init__(self, manager):
+        self.manager = manager
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def get(self, key):
+        self.commands.append(lambda: self.manager.data.get(key))
+
+    def incr(self, key):
+        def incr():
+            self.manager.data[key] = str(int(self.manager.data.get(key, 0)) + 1).encode()
+            return int(self.manager.data[key])
+        self.commands.append(incr)
+
+    def expire(self, key, seconds):
+        self.commands.append(lambda: True)
+
+    def delete(self, key):
+        self.commands.append(lambda: 1 if self.manager.data.pop(key, None) is not None else 0)
+
+    async def execute(self):
+        return [command() for command in self.commands]
+
+
+class FakeRedisManager:
+    def __init__(self):
+        self.data = {}
+        self.published = []
+        self.redis = self
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def transaction(self):
+        return FakePipeline(self)
+
+    async def set_if_version(self, key, value, expire, version_key, version):
+        if self.data.get(version_key, b"0") != str(version).encode():
+            return False
+        self.data[key] = value
+        return True
+
+    async def publish(self, channel, message):
+        self.published.append(channel)
+
+
+class FakeGenres:
+    def __init__(self, genres):
+        self.genres = genres
+        self.calls = 0
+
+    async def get_all_with_book_counts(self):
+        self.calls += 1
+        return list(self.genres)
+
+
+class FakeDB:
+    def __init__(self, genres):
+        self.genres = FakeGenres(genres)
+
+
+async def test_genres_are_served_from_memory_until_invalidated():
+    fantasy = GenreWithCount(id=uuid.uuid4(), name="Fantasy", books_count=2)
+    db = FakeDB([fantasy])
+    redis_manager = FakeRedisManager()
+    cache = GenreCache(redis_manager, local_ttl=60, expire=60)
+
+    assert await cache.get_all(db) == [fantasy]
+    assert await cache.get_by_ids(db, [fantasy.id, fantasy.id]) == [fantasy]
+    assert db.genres.calls == 1
+
+    await cache.invalidate()
+    assert redis_manager.published == ["genres:invalidate"]
+    await cache.get_all(db)
+    assert db.genres.calls == 2
+
+
+async def test_other_workers_load_snapshot_from_redis():
+    fantasy = GenreWithCount(id=uuid.uuid4(), name="Fantasy", books_count=0)
+    redis_manager = FakeRedisManager()
+    await GenreCache(redis_manager, local_ttl=60, expire=60).get_all(FakeDB([fantasy]))
+
+    other_db = FakeDB([])
+    assert await GenreCache(redis_manager, local_ttl=60, expire=60).get_all(other_db) == [fantasy]
+    assert other_db.genres.calls == 0
+
+
+async def test_unknown_genre_id_reloads_snapshot_from_db_once():
+    fantasy = GenreWithCount(id=uuid.uuid4(), name="Fantasy", books_count=0)
+    db = FakeDB([fantasy])
+    cache = GenreCache(FakeRedisManager(), local_ttl=60, expire=60)
+    await cache.get_all(db)
+
+    # жанр создан в другом воркере, сообщение об инвалидации сюда ещё не пришло
+    poetry = GenreWithCount(id=uuid.uuid4(), name="Poetry", books_count=0)
+    db.genres.genres.append(poetry)
+    assert await cache.get_by_ids(db, [fantasy.id, poetry.id]) == [fantasy, poetry]
+    assert db.genres.calls == 2
+
+    assert await cache.get_by_ids(db, [poetry.id, uuid.uuid4()]) == [poetry]
+    assert db.genres.calls == 3
+
+
+async def test_snapshot_read_before_invalidation_is_not_stored_in_redis():
+    fantasy = GenreWithCount(id=uuid.uuid4(), name="Fantasy", books_count=0)
+    redis_manager = FakeRedisManager()
+    cache = GenreCache(redis_manager, local_ttl=60, expire=60)
+
+    class RacingGenres(FakeGenres):
+        async def get_all_with_book_counts(self):
+            genres = await super().get_all_with_book_counts()
+            # запись жанра коммитится и инвалидирует кэш, пока читался старый снимок
+            await GenreCache(redis_manager, local_ttl=60, expire=60).invalidate()
+            return genres
+
+    db = FakeDB([])
+    db.genres = RacingGenres([fantasy])
+    await cache.get_all(db)
+    assert cache.key not in redis_manager.data
+
+    await GenreCache(redis_manager, local_ttl=60, expire=60).get_all(FakeDB([fantasy]))
+    assert cache.key in redis_manager.data
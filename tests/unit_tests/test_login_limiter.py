@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from src.utilis.login_limiter import LoginLimiter
+
+
+class FakePipeline:
+    def __init__(self, data):
+        self.data = data
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def get(self, key):
+        self.commands.append(lambda: self.data.get(key))
+
+    def ttl(self, key):
+        self.commands.append(lambda: 30 if key in self.data else -2)
+
+    def set(self, key, value, ex, nx):
+        self.commands.append(lambda: self.data.setdefault(key, value))
+
+    def incr(self, key):
+        def run():
+            self.data[key] = int(self.data[key]) + 1
+            return self.data[key]
+        self.commands.append(run)
+
+    async def execute(self):
+        return [command() for command in self.commands]
+
+
+class FakeRedisManager:
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self):
+        return FakePipeline(self.data)
+
+    def transaction(self):
+        return FakePipeline(self.data)
+
+
+async def test_admission_slot_is_held_until_the_block_exits():
+    limiter = LoginLimiter(FakeRedisManager(), max_in_flight=2, attempts=10, window=60)
+    release = asyncio.Event()
+
+    async def login():
+        async with limiter.admit("user"):
+            await release.wait()
+
+    tasks = [asyncio.create_task(login()) for _ in range(2)]
+    await asyncio.sleep(0)
+    with pytest.raises(HTTPException) as exc:
+        async with limiter.admit("user"):
+            pass
+    assert exc.value.status_code == 429
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert limiter.in_flight == 0
+
+
+async def test_only_failed_attempts_count_towards_the_window():
+    limiter = LoginLimiter(FakeRedisManager(), max_in_flight=10, attempts=2, window=60)
+    for _ in range(5):
+        async with limiter.admit("User"):
+            pass
+
+    await limiter.record_failure("user")
+    await limiter.record_failure("USER")
+    with pytest.raises(HTTPException) as exc:
+        async with limiter.admit("user"):
+            pass
+    assert exc.value.headers["Retry-After"] == "30"
@@ -0,0 +1,18 @@
+import uuid
+
+import pytest
+
+from src.utilis.pagination import encode_cursor, decode_cursor
+
+
+def test_cursor_roundtrip():
+    book_id = str(uuid.uuid4())
+    cursor = encode_cursor([4.5, book_id])
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == [4.5, book_id]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "eyJhIjoxfQ"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
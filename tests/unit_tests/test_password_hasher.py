@@ -0,0 +1,42 @@
+import asyncio
+import threading
+import time
+
+from src.security import PasswordHasher, hash_password_async, verify_password_async
+
+
+async def test_async_hash_round_trip():
+    hashed = await hash_password_async("secret123")
+
+    assert hashed != "secret123"
+    assert await verify_password_async("secret123", hashed) is True
+    assert await verify_password_async("wrong-password", hashed) is False
+
+
+async def test_hasher_runs_at_most_max_workers_jobs_at_once():
+    hasher = PasswordHasher(max_workers=2)
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def job():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return True
+
+    tasks = [asyncio.create_task(hasher._run(job)) for _ in range(6)]
+    await asyncio.sleep(0.01)
+    assert hasher.in_flight == 6
+    assert hasher.queue_depth == 4
+
+    assert all(await asyncio.gather(*tasks))
+    assert peak == 2
+    stats = hasher.stats()
+    assert stats["completed"] == 6
+    assert stats["in_flight"] == 0
+    assert stats["avg_queue_wait_ms"] > 0
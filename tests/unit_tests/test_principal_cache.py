@@ -0,0 +1,22 @@
+import uuid
+
+from src.schemas.users import UserPrincipal
+from src.utilis.enums import RoleEnum
+from src.utilis.principal_cache import PrincipalCache
+from tests.unit_tests.test_genre_cache import FakeRedisManager
+
+
+async def test_principal_read_before_invalidation_is_not_cached():
+    redis_manager = FakeRedisManager()
+    cache = PrincipalCache(redis_manager, maxsize=10, local_ttl=60, redis_ttl=60)
+    principal = UserPrincipal(id=uuid.uuid4(), role=RoleEnum.USER, is_active=True)
+
+    # запрос прочитал пользователя, админ заблокировал его до set
+    since = await cache.begin(principal.id)
+    await cache.invalidate(principal.id)
+    await cache.set(principal, since)
+    assert await cache.get(principal.id) is None
+
+    since = await cache.begin(principal.id)
+    await cache.set(principal, since)
+    assert await cache.get(principal.id) == principal
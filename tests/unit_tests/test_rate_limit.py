@@ -0,0 +1,50 @@
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.config import RateLimitPolicy
+from src.utilis.rate_limit import RateLimitMiddleware, SlidingWindowRateLimiter
+
+POLICIES = [
+    RateLimitPolicy(name="default", limit=600, window=60),
+    RateLimitPolicy(name="book-detail", path=r"/books/[0-9a-fA-F-]{36}", methods=["GET"], limit=120, window=60),
+    RateLimitPolicy(name="login", path=r"/auth/token", methods=["POST"], limit=60, window=60, scope="ip"),
+]
+
+
+def test_match_selects_route_and_method_policies():
+    limiter = SlidingWindowRateLimiter(redis_manager=None, policies=POLICIES)
+    book_path = "/books/0b9f3c1e-8a4d-4b6e-9c2f-1d7a5e3b8c40"
+
+    assert [p.name for p in limiter.match("GET", book_path)] == ["default", "book-detail"]
+    assert [p.name for p in limiter.match("PUT", book_path)] == ["default"]
+    assert [p.name for p in limiter.match("GET", "/books/search")] == ["default"]
+    assert [p.name for p in limiter.match("POST", "/auth/token")] == ["default", "login"]
+
+
+def test_keys_fall_back_to_ip_for_anonymous_and_ip_scoped_policies():
+    limiter = SlidingWindowRateLimiter(redis_manager=None, policies=POLICIES)
+    default, _, login = POLICIES
+
+    assert limiter._key(default, "u1", "10.0.0.1") == "ratelimit:default:user:u1"
+    assert limiter._key(default, None, "10.0.0.1") == "ratelimit:default:ip:10.0.0.1"
+    assert limiter._key(login, "u1", "10.0.0.1") == "ratelimit:login:ip:10.0.0.1"
+
+
+class DownRedisManager:
+    @property
+    def redis(self):
+        raise RedisConnectionError("Redis is down")
+
+
+async def test_middleware_fails_open_when_redis_is_unavailable():
+    app = FastAPI()
+
+    @app.get("/books")
+    async def books():
+        return []
+
+    app.add_middleware(RateLimitMiddleware, limiter=SlidingWindowRateLimiter(DownRedisManager(), POLICIES))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/books")
+    assert resp.status_code == 200
@@ -0,0 +1,95 @@
+from fnmatch import fnmatchcase
+
+from src.utilis.client_cache import ClientSideCache
+from src.utilis.redis_manager import RedisManager
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def unlink(self, key):
+        self.commands.append(key)
+
+    async def execute(self):
+        self.redis.pipelines.append(len(self.commands))
+        return [1 if self.redis.data.pop(key, None) is not None else 0 for key in self.commands]
+
+
+class FakeRedis:
+    def __init__(self, keys):
+        self.data = {key: b"1" for key in keys}
+        self.pipelines = []
+
+    async def scan_iter(self, match, count):
+        for key in list(self.data):
+            if fnmatchcase(key, match):
+                yield key
+
+    def pipeline(self, transaction):
+        return FakePipeline(self)
+
+
+async def test_delete_pattern_unlinks_matching_keys_in_batches():
+    manager = RedisManager(host="localhost", port=6379)
+    manager.redis = FakeRedis([f"search:books:{i}" for i in range(7)] + ["books:1", "tmp:1"])
+
+    deleted = await manager.delete_pattern("search:books:*", batch_size=3)
+
+    assert deleted == 7
+    assert manager.redis.pipelines == [3, 3, 1]
+    assert set(manager.redis.data) == {"books:1", "tmp:1"}
+
+
+class CountingRedis(FakeRedis):
+    def __init__(self, data):
+        super().__init__([])
+        self.data = data
+        self.calls = 0
+
+    async def get(self, key):
+        self.calls += 1
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        self.calls += 1
+        return [self.data.get(key) for key in keys]
+
+
+def make_cached_manager(data):
+    cache = ClientSideCache(host="localhost", port=6379, prefixes=["cache:books:"], maxsize=100, ttl=60)
+    cache.active = True
+    manager = RedisManager(host="localhost", port=6379, client_cache=cache)
+    manager.redis = CountingRedis(data)
+    return manager, cache
+
+
+async def test_client_cache_serves_tracked_keys_until_invalidated():
+    manager, cache = make_cached_manager({"cache:books:1": b"v1", "other": b"x"})
+
+    assert await manager.get("cache:books:1") == b"v1"
+    assert await manager.get("cache:books:1") == b"v1"
+    assert await manager.get("other") == b"x"
+    assert manager.redis.calls == 2
+
+    manager.redis.data["cache:books:1"] = b"v2"
+    await cache._on_invalidate([b"invalidate", [b"cache:books:1"]])
+    assert await manager.get("cache:books:1") == b"v2"
+
+
+async def test_mget_fetches_only_missing_keys_in_one_round_trip():
+    manager, cache = make_cached_manager({"cache:books:1": b"a", "cache:books:2": b"b"})
+    await manager.get("cache:books:1")
+
+    values = await manager.mget(["cache:books:1", "cache:books:2", "cache:books:3"])
+
+    assert values == [b"a", b"b", None]
+    assert manager.redis.calls == 2
+    assert len(cache.local) == 2
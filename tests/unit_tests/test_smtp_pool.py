@@ -0,0 +1,72 @@
+from email.message import EmailMessage
+
+import pytest
+from aiosmtplib import SMTPServerDisconnected
+
+from src.utilis.smtp_pool import SMTPPool
+
+
+class FakeSMTP:
+    opened = []
+
+    def __init__(self, hostname, port, use_tls):
+        self.is_connected = False
+        self.sent = []
+        self.fail_next = False
+        FakeSMTP.opened.append(self)
+
+    async def connect(self):
+        self.is_connected = True
+
+    async def login(self, username, password):
+        pass
+
+    async def send_message(self, message):
+        if self.fail_next:
+            raise SMTPServerDisconnected("connection lost")
+        self.sent.append(message)
+
+    async def noop(self):
+        pass
+
+    async def quit(self):
+        self.is_connected = False
+
+    def close(self):
+        self.is_connected = False
+
+
+def make_message(to: str) -> EmailMessage:
+    message = EmailMessage()
+    message["To"] = to
+    message.set_content("review")
+    return message
+
+
+@pytest.fixture
+def pool():
+    FakeSMTP.opened = []
+    return SMTPPool("localhost", 1025, "user", "pass", use_tls=False, size=1, smtp_factory=FakeSMTP)
+
+
+async def test_pool_reuses_connection(pool):
+    assert await pool.send_many([make_message("a@example.com"), make_message("b@example.com")]) == 2
+    assert await pool.send_many([make_message("c@example.com")]) == 1
+
+    assert len(FakeSMTP.opened) == 1
+    assert len(FakeSMTP.opened[0].sent) == 3
+
+
+async def test_pool_discards_broken_connection(pool):
+    await pool.send_many([make_message("a@example.com")])
+    FakeSMTP.opened[0].fail_next = True
+
+    with pytest.raises(SMTPServerDisconnected):
+        await pool.send_many([make_message("b@example.com")])
+    assert not FakeSMTP.opened[0].is_connected
+
+    await pool.send_many([make_message("c@example.com")])
+    assert len(FakeSMTP.opened) == 2
+
+    await pool.close()
+    assert not FakeSMTP.opened[1].is_connected
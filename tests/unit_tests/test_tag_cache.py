@@ -0,0 +1,21 @@
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.utilis.tag_cache import TagCache
+
+
+class DownRedisManager:
+    async def get(self, key):
+        raise RedisConnectionError("Redis is down")
+
+    @property
+    def redis(self):
+        raise RedisConnectionError("Redis is down")
+
+
+async def test_redis_errors_fall_back_to_db():
+    cache = TagCache(DownRedisManager())
+
+    assert await cache.get("books:1") is None
+    assert await cache.begin() is None
+    assert not await cache.set("books:1", b"page", tags=["book:1"], expire=60, since=None)
+    assert not await cache.set("books:1", b"page", tags=["book:1"], expire=60, since=0)